@@ -13,8 +13,561 @@ __author__ = 'Urban Skalar'
 __license__ = 'GNU General Public License v3.0'
 
 
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import re
+import string
+import tempfile
+import threading
+import time
+import urllib.parse
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 import requests
 import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Errors of both requests session and httpx client, if it is installed
+_HTTP_ERRORS = (requests.RequestException, httpx.HTTPError) if httpx else (requests.RequestException,)
+
+# Typed responses (e.g. FundHoldings.getInstitutionalHoldersTyped) are validated with pydantic (version 2)
+try:
+    import pydantic
+except ImportError:
+    pydantic = None
+
+# Compact rows (e.g. FundHoldings.getForm13fByCikRows) are decoded with msgspec
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Prefer orjson for parsing responses and writing them to cache, it is several times faster than json on large
+# responses. Both variants of "_dumps" return UTF-8 encoded bytes.
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+# Brotli compressed responses can only be decoded if brotli (or brotlicffi) is installed
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _ACCEPT_ENCODING = 'br, gzip, deflate'
+    except ImportError:
+        _ACCEPT_ENCODING = 'gzip, deflate'
+
+# Countries supported by stock screener are saved in this directory (or "cache_dir") for COUNTRY_LIST_TTL seconds
+COUNTRY_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'fmp_api')
+COUNTRY_LIST_TTL = 30 * 86400
+
+# Seconds to wait for API to connect or send the next part of response
+TIMEOUT = 30
+
+# Base urls of both API versions
+_BASE_V3 = 'https://financialmodelingprep.com/api/v3'
+_BASE_V4 = 'https://financialmodelingprep.com/api/v4'
+
+# Headers sent with every request, all endpoints respond with (compressed) JSON
+HEADERS = {
+    'Accept': 'application/json',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+    'User-Agent': 'FMP_api (python)',
+}
+
+
+# Cache lifetime (in seconds) of endpoints, which change more often than default cache lifetime
+ENDPOINT_TTL = {
+    # Prices
+    'quote': 60,
+    'quote-short': 60,
+    'quotes': 60,
+    'historical-chart': 60,
+    'gainers': 60,
+    'losers': 60,
+    'actives': 60,
+    'insider-trading-rss-feed': 300,
+    # Calendars
+    'earning_calendar': 300,
+    'ipo_calendar': 300,
+    'stock_split_calendar': 300,
+    'stock_dividend_calendar': 300,
+    'economic_calendar': 300,
+}
+
+# Endpoints, whose responses are lists ordered from the newest record. Response with lower "limit" is therefore just
+# the beginning of response with higher "limit" and can be taken from its cached copy.
+_LIMIT_ENDPOINTS = frozenset({
+    'income-statement', 'balance-sheet-statement', 'cash-flow-statement',
+    'income-statement-as-reported', 'balance-sheet-statement-as-reported', 'cash-flow-statement-as-reported',
+    'ratios', 'enterprise-values', 'key-metrics', 'financial-growth',
+    'income-statement-growth', 'balance-sheet-statement-growth', 'cash-flow-statement-growth',
+    'historical-rating', 'historical-daily-discounted-cash-flow',
+})
+
+# Column data types of DataFrames, returned by "FMP.DataFrames" (columns which pandas doesn't infer by itself)
+_STATEMENT_DATES = {'date': 'datetime64[ns]', 'fillingDate': 'datetime64[ns]', 'acceptedDate': 'datetime64[ns]'}
+_OHLC = {'date': 'datetime64[ns]', 'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64'}
+_SCHEMA = {
+    # Stock fundamentals
+    'income-statement': _STATEMENT_DATES,
+    'balance-sheet-statement': _STATEMENT_DATES,
+    'cash-flow-statement': _STATEMENT_DATES,
+    'income-statement-as-reported': {'date': 'datetime64[ns]'},
+    'balance-sheet-statement-as-reported': {'date': 'datetime64[ns]'},
+    'cash-flow-statement-as-reported': {'date': 'datetime64[ns]'},
+    'shares_float': {'date': 'datetime64[ns]'},
+    # Stock fundamentals analysis
+    'ratios': {'date': 'datetime64[ns]'},
+    'enterprise-values': {'date': 'datetime64[ns]'},
+    'income-statement-growth': {'date': 'datetime64[ns]'},
+    'balance-sheet-statement-growth': {'date': 'datetime64[ns]'},
+    'cash-flow-statement-growth': {'date': 'datetime64[ns]'},
+    'key-metrics': {'date': 'datetime64[ns]'},
+    'financial-growth': {'date': 'datetime64[ns]'},
+    'rating': {'date': 'datetime64[ns]'},
+    'historical-rating': {'date': 'datetime64[ns]'},
+    'discounted-cash-flow': {'date': 'datetime64[ns]'},
+    'historical-discounted-cash-flow-statement': {'date': 'datetime64[ns]'},
+    'historical-daily-discounted-cash-flow': {'date': 'datetime64[ns]'},
+    # Stock calendars
+    'earning_calendar': {'date': 'datetime64[ns]', 'fiscalDateEnding': 'datetime64[ns]',
+                         'updatedFromDate': 'datetime64[ns]'},
+    'ipo_calendar': {'date': 'datetime64[ns]'},
+    'stock_split_calendar': {'date': 'datetime64[ns]'},
+    'stock_dividend_calendar': {'date': 'datetime64[ns]', 'recordDate': 'datetime64[ns]',
+                                'paymentDate': 'datetime64[ns]', 'declarationDate': 'datetime64[ns]'},
+    'economic_calendar': {'date': 'datetime64[ns]'},
+    # Company information
+    'market-capitalization': {'date': 'datetime64[ns]'},
+    'historical-market-capitalization': {'date': 'datetime64[ns]'},
+    'delisted-companies': {'ipoDate': 'datetime64[ns]', 'delistedDate': 'datetime64[ns]'},
+    # Stock news
+    'stock_news': {'publishedDate': 'datetime64[ns]'},
+    'press-releases': {'date': 'datetime64[ns]'},
+    # Market performance
+    'sector_price_earning_ratio': {'date': 'datetime64[ns]', 'pe': 'float64'},
+    'industry_price_earning_ratio': {'date': 'datetime64[ns]', 'pe': 'float64'},
+    'historical-sectors-performance': {'date': 'datetime64[ns]'},
+    # Prices are kept as float64, float32 would lose cents of prices above ~100000 (e.g. BRK-A)
+    'historical-chart': _OHLC,
+    'historical-price-full': dict(_OHLC, adjClose='float64'),
+    'social-sentiment': {'date': 'datetime64[ns]'},
+    'grade': {'date': 'datetime64[ns]'},
+    'earnings-surprises': {'date': 'datetime64[ns]'},
+    'analyst-estimates': {'date': 'datetime64[ns]'},
+    'insider-trading': {'transactionDate': 'datetime64[ns]', 'filingDate': 'datetime64[ns]'},
+}
+
+# Dates are checked for their format with plain string operations and for existence with datetime.date, which is
+# much faster than datetime.strptime
+
+
+def _is_ymd(date: str):
+    """
+    Returns True if date looks like "YYYY-mm-dd": ten ASCII characters, digits separated by dashes.
+    """
+
+    return (len(date) == 10 and date[4] == '-' and date[7] == '-' and date.isascii() and date[:4].isdigit()
+            and date[5:7].isdigit() and date[8:].isdigit())
+
+
+def _check_ymd(date: str):
+    """
+    Returns True if "YYYY-mm-dd" date exists.
+    """
+
+    try:
+        datetime.date(int(date[:4]), int(date[5:7]), int(date[8:10]))
+    except ValueError:
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_date(date: str):
+    """
+    Returns True if date is in "YYYY-mm-dd" format. Results are cached, since the same dates are usually checked
+    over and over again.
+    """
+
+    return isinstance(date, str) and _is_ymd(date) and _check_ymd(date)
+
+
+def _require_date(date: str, name: str):
+    """
+    Raises ValueError if date is not in "YYYY-mm-dd" format.
+    """
+
+    if not _validate_date(date):
+        raise ValueError(f'Parameter "{name}" not specified correctly. Date should be in "YYYY-mm-dd" format!')
+
+
+# Plain tickers (one or more, separated by commas) are inserted into urls as they are
+_TICKER_RE = re.compile(r'^[A-Z0-9.\-^]{1,12}(,[A-Z0-9.\-^]{1,12})*\Z')
+
+
+def _quote(ticker: str):
+    """
+    Returns ticker (or any other value of url path or query) escaped for url, so characters such as "&", "?", "/" or
+    space don't break the request.
+    """
+
+    ticker = str(ticker)
+    if _TICKER_RE.match(ticker):
+        return ticker
+    return urllib.parse.quote(ticker, safe=',')
+
+
+def _urlTemplate(template: str):
+    """
+    Returns function, which fills "{}" fields of url template (in str.format syntax) with its arguments, escaped with
+    "_quote". Template is split into its constant parts once, so each call only joins them with arguments, which is
+    several times faster than str.format.
+    """
+
+    parts = ['']
+    for literal, field, _, _ in string.Formatter().parse(template):
+        parts[-1] += literal
+        if field is not None:
+            parts.append('')
+
+    if len(parts) == 2:
+        prefix, suffix = parts
+
+        def build(value):
+            return f'{prefix}{_quote(value)}{suffix}'
+    elif len(parts) == 3:
+        prefix, middle, suffix = parts
+
+        def build(first, second):
+            return f'{prefix}{_quote(first)}{middle}{_quote(second)}{suffix}'
+    else:
+        def build(*args):
+            return template.format(*map(_quote, args))
+    return build
+
+
+# Allowed values of parameters
+_PERIODS = frozenset({'annual', 'quarter'})
+_PERIODS_OPT = _PERIODS | {None}
+_STMT3 = frozenset({'income-statement', 'balance-sheet-statement', 'cash-flow-statement'})
+_STMT4 = _STMT3 | {'financial-statement-full'}
+_FY = frozenset({'FY', 'Q1', 'Q2', 'Q3', 'Q4'})
+_TIMEFRAMES = frozenset({'1min', '5min', '15min', '30min', '1hour', '4hour'})
+_SERIES_TYPES = frozenset({'line', 'bar'})
+_INDICATOR_TYPES = frozenset({'sma', 'ema', 'wma', 'dema', 'tema', 'williams', 'rsi', 'adx', 'standardDeviation'})
+_SYMBOL_LIST_TYPES = frozenset({'euronext', 'tsx', 'cryptocurrencies', 'forex-currency-pairs', 'commodities', 'etfs',
+                                'mutual-funds', 'indexes', 'stocks'})
+_SEARCH_EXCHANGES = frozenset({'ETF', 'MUTUAL_FUND', 'COMMODITY', 'INDEX', 'CRYPTO', 'FOREX', 'TSX', 'AMEX', 'NASDAQ',
+                               'NYSE', 'EURONEXT', 'XETRA', 'NSE', 'LSE'})
+_SCREENER_EXCHANGES = frozenset({'nyse', 'nasdaq', 'amex', 'euronext', 'tsx', 'etf', 'mutual_fund'})
+_SECTORS = frozenset({'Consumer Cyclical', 'Energy', 'Technology', 'Industrials', 'Financial Services',
+                      'Basic Materials', 'Communication Services', 'Consumer Defensive', 'Healthcare', 'Real Estate',
+                      'Utilities', 'Industrial Goods', 'Financial', 'Services', 'Conglomerates'})
+_INDUSTRIES = frozenset({'Autos', 'Banks', 'Banks Diversified', 'Software', 'Banks Regional', 'Beverages Alcoholic',
+                         'Beverages Brewers', 'Beverages Non-Alcoholic'})
+
+# Error messages of the above lists
+_SEARCH_EXCHANGES_ERROR = 'Parameter "exchange" can only be one of the following: \n' + str(sorted(_SEARCH_EXCHANGES))
+_SCREENER_EXCHANGES_ERROR = 'Parameter "exchange" can only be one of the following: \n' + str(
+    sorted(_SCREENER_EXCHANGES))
+_SECTORS_ERROR = 'Parameter "sector" can only be one of the following: \n' + str(sorted(_SECTORS))
+_INDUSTRIES_ERROR = 'Parameter "industry" can only be one of the following: \n' + str(sorted(_INDUSTRIES))
+# Allowed values and error messages of validated stock screener parameters: sector, industry and exchange
+_SCREENER_VALIDATORS = ((_SECTORS, _SECTORS_ERROR), (_INDUSTRIES, _INDUSTRIES_ERROR),
+                        (_SCREENER_EXCHANGES, _SCREENER_EXCHANGES_ERROR))
+# Query parameters of SIC endpoints, in order of their arguments (ticker, industryTitle, cik, sic)
+_SIC_PARAMS = ('symbol', 'industryTitle', 'cik', 'sicCode')
+# Query parameters of stock screener, in order of getStockScreener arguments
+_SCREENER_FIELDS = ('marketCapMoreThan', 'marketCapLowerThan', 'priceMoreThan', 'priceLowerThan', 'betaMoreThan',
+                    'betaLowerThan', 'volumeMoreThan', 'volumeLowerThan', 'dividendMoreThan', 'dividendLowerThan',
+                    'isEtf', 'isActivelyTrading', 'sector', 'industry', 'country', 'exchange', 'limit')
+
+
+def _validate(value, name: str, allowed: frozenset):
+    """
+    Raises ValueError if value is not one of the allowed values.
+    """
+
+    if value not in allowed:
+        # Error message is only built when it is needed, e.g. '"annual", "quarter" or None'
+        choices = ['None' if v is None else f'"{v}"' for v in sorted(allowed, key=lambda v: (v is None, str(v)))]
+        expected = ' or '.join(filter(None, [', '.join(choices[:-1]), choices[-1]]))
+        raise ValueError(f'Parameter "{name}" not specified correctly. Should be {expected}!')
+
+
+class FMPError(Exception):
+    """
+    Raised when API responds with status other than "200 - OK".
+
+    Response status code is kept in "status_code" and the beginning of response body in "body".
+    """
+
+    # Number of bytes of response body kept in the error
+    MAX_BODY = 512
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.body = content[:self.MAX_BODY].decode('utf-8', 'replace')
+        super().__init__(f'Expected response "200 - OK", instead you got "{status_code} - {self.body}"')
+
+
+class FMPRateLimited(FMPError):
+    """
+    Raised when API still responds with "429 - Too Many Requests" after all retries.
+
+    Seconds to wait before the next request (from "Retry-After" header) are kept in "retry_after" and the number of
+    remaining requests (from "X-Rate-Limit-Remaining" header) in "remaining", both None if API didn't send them.
+    """
+
+    def __init__(self, status_code: int, content: bytes, headers):
+        super().__init__(status_code, content)
+        retry_after = headers.get('Retry-After')
+        self.retry_after = int(retry_after) if retry_after and retry_after.isdigit() else None
+        remaining = headers.get('X-Rate-Limit-Remaining')
+        self.remaining = int(remaining) if remaining and remaining.isdigit() else None
+
+
+def _httpError(status_code: int, content: bytes, headers):
+    """
+    Returns FMPRateLimited for "429 - Too Many Requests", otherwise FMPError.
+    """
+
+    if status_code == 429:
+        return FMPRateLimited(status_code, content, headers)
+    return FMPError(status_code, content)
+
+
+class FileCache:
+    """
+    Persistent cache of API responses.
+
+    Every response is saved as JSON file "{cache_dir}/{endpoint}/{key}.json", together with the time it was
+    requested at and headers of conditional request, which revalidates it (if API sent its ETag or Last-Modified).
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Constructs the FileCache instance.
+        """
+
+        self.cache_dir = cache_dir
+
+    def _path(self, endpoint: str, key: str):
+        return os.path.join(self.cache_dir, endpoint, key + '.json')
+
+    def get(self, endpoint: str, key: str):
+        """
+        Returns (timestamp, body, validators) tuple of cached response or None, if response is not cached.
+        """
+
+        try:
+            with open(self._path(endpoint, key), 'rb') as file:
+                entry = _loads(file.read())
+        except (OSError, ValueError):
+            return None
+
+        return entry['timestamp'], entry['body'], entry.get('validators')
+
+    def set(self, endpoint: str, key: str, value: tuple):
+        """
+        Saves (timestamp, body, validators) tuple of response.
+        """
+
+        timestamp, body, validators = value
+        path = self._path(endpoint, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to temporary file first, so other processes never read partially written file. Each write has its own
+        # temporary file, so threads saving the same response don't replace each other's file.
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(path) + '.', dir=os.path.dirname(path))
+        try:
+            with open(fd, 'wb') as file:
+                file.write(_dumps({'timestamp': timestamp, 'body': body, 'validators': validators}))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def clear(self):
+        """
+        Removes all saved responses.
+        """
+
+        for directory, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.json'):
+                    os.remove(os.path.join(directory, name))
+
+
+class MemoryCache:
+    """
+    In-process cache of API responses, which keeps up to "maxsize" most recently used responses.
+
+    Cached responses are returned as they are, so they should not be modified by the caller.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Constructs the MemoryCache instance.
+        """
+
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """
+        Returns (timestamp, body) tuple of cached response or None, if response is not cached.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: tuple):
+        """
+        Saves (timestamp, body) tuple of response, dropping the least recently used one if cache is full.
+        """
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+if pydantic is not None:
+    class EtfHolder(pydantic.BaseModel):
+        """
+        Stock held by ETF, see FundHoldings.getEtfHolders.
+        """
+        asset: str
+        sharesNumber: Optional[int] = None
+        weightPercentage: Optional[float] = None
+
+    class InstitutionalHolder(pydantic.BaseModel):
+        """
+        Institutional holder of stock, see FundHoldings.getInstitutionalHolders.
+        """
+        holder: str
+        shares: Optional[int] = None
+        dateReported: Optional[datetime.date] = None
+        change: Optional[int] = None
+
+    class Form13FEntry(pydantic.BaseModel):
+        """
+        Position of Form 13F statement, see FundHoldings.getForm13fByCik.
+        """
+        date: datetime.date
+        fillingDate: Optional[datetime.date] = None
+        acceptedDate: Optional[datetime.datetime] = None
+        cik: str
+        cusip: Optional[str] = None
+        tickercusip: Optional[str] = None
+        nameOfIssuer: Optional[str] = None
+        shares: Optional[int] = None
+        titleOfClass: Optional[str] = None
+        value: Optional[int] = None
+        link: Optional[str] = None
+        finalLink: Optional[str] = None
+
+    # Validators of whole responses, by endpoint. Fields, which aren't listed in models, are ignored.
+    _TYPED_ADAPTERS = {
+        'etf-holder': pydantic.TypeAdapter(List[EtfHolder]),
+        'institutional-holder': pydantic.TypeAdapter(List[InstitutionalHolder]),
+        'form-thirteen': pydantic.TypeAdapter(List[Form13FEntry]),
+    }
+
+
+if msgspec is not None:
+    # Rows only hold the most used fields, others are skipped while decoding. Their fields are never cyclic
+    # references, so they are left out of garbage collection.
+    class EtfHolderRow(msgspec.Struct, gc=False):
+        """
+        Stock held by ETF, see FundHoldings.getEtfHolders.
+        """
+        asset: str
+        sharesNumber: Optional[int] = None
+        weightPercentage: Optional[float] = None
+
+    class InstitutionalHolderRow(msgspec.Struct, gc=False):
+        """
+        Institutional holder of stock, see FundHoldings.getInstitutionalHolders.
+        """
+        holder: str
+        shares: Optional[int] = None
+        dateReported: Optional[datetime.date] = None
+        change: Optional[int] = None
+
+    class Form13FRow(msgspec.Struct, gc=False):
+        """
+        Position of Form 13F statement, see FundHoldings.getForm13fByCik. Ticker is API's "tickercusip" field.
+        """
+        date: datetime.date
+        cik: str
+        ticker: Optional[str] = msgspec.field(default=None, name='tickercusip')
+        nameOfIssuer: Optional[str] = None
+        shares: Optional[int] = None
+        value: Optional[int] = None
+
+    # Decoders of whole responses, by endpoint
+    _ROW_DECODERS = {
+        'etf-holder': msgspec.json.Decoder(List[EtfHolderRow]),
+        'institutional-holder': msgspec.json.Decoder(List[InstitutionalHolderRow]),
+        'form-thirteen': msgspec.json.Decoder(List[Form13FRow]),
+    }
+
+
+def _typedAdapter(endpoint: str):
+    """
+    Returns pydantic TypeAdapter, which validates JSON response of endpoint into list of models.
+    """
+
+    if pydantic is None:
+        raise ImportError('Typed responses require "pydantic" package. Install it with "pip install pydantic"!')
+    return _TYPED_ADAPTERS[endpoint]
+
+
+def _rowDecoder(endpoint: str):
+    """
+    Returns msgspec Decoder, which decodes JSON response of endpoint into list of rows.
+    """
+
+    if msgspec is None:
+        raise ImportError('Compact rows require "msgspec" package. Install it with "pip install msgspec"!')
+    return _ROW_DECODERS[endpoint]
 
 
 class FMP:
@@ -24,15 +577,98 @@ class FMP:
     https://financialmodelingprep.com/developer/docs
     """
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_dir: str = None, cache_ttl: int = 86400, endpoint_ttl: dict = None,
+                 memory_cache_size: int = 0, stale_on_error: bool = False, prefetch: bool = False,
+                 http2: bool = False, session=None, async_session=None):
         """
         Constructs the FMP instance.
+
+        Responses are cached on disk only if "cache_dir" is specified and in memory only if "memory_cache_size" is
+        greater than 0. They are kept for "cache_ttl" seconds, except for endpoints listed in ENDPOINT_TTL or
+        "endpoint_ttl", which override it.
+
+        If "stale_on_error" is True, requests failed with connection error, rate limit (429) or server error (5xx)
+        return cached response even if it has already expired.
+
+        If "prefetch" is True, connection to API is opened in background, so the first request doesn't have to wait
+        for it.
+
+        If "http2" is True, requests are sent over HTTP/2 with httpx client, so sequential and concurrent requests
+        share a single connection. Requests session is used instead if "httpx" or "h2" package isn't installed.
+
+        If "session" is given (e.g. "session" of another FMP instance), requests are sent through it instead of a new
+        session, so all instances share the same pooled connections. Shared session isn't closed by "close".
+        Likewise "async_session" (httpx.AsyncClient) is shared by asynchronous requests of all instances it is given
+        to and isn't closed by "aclose". It is bound to the event loop it is used in, so use it with "gather" rather
+        than "map_async", which runs its own event loop.
+
+        Parameter           data type           example
+        api_key             str                 'YOUR API KEY'
+        cache_dir           str                 '.fmp_cache'
+        cache_ttl           int                 86400
+        endpoint_ttl        dict                {'quote': 10}
+        memory_cache_size   int                 1024
+        stale_on_error      bool                True
+        prefetch            bool                True
+        http2               bool                True
+        session             requests.Session    other_fmp.session
+        async_session       httpx.AsyncClient   httpx.AsyncClient(http2=True)
         """
 
         self.API_KEY = api_key
-
-        # Start new session
-        self.session = requests.Session()
+        # API key query parameter, built once and appended to urls with ("&apikey=...") or without ("?apikey=...")
+        # other parameters
+        self._apikey_qs = f'apikey={api_key}'
+        self._apikey_suffix = f'&{self._apikey_qs}'
+        self._apikey_param = f'?{self._apikey_qs}'
+        # The same, with braces escaped, for url templates (see _urlTemplate)
+        self._apikey_param_fmt = self._apikey_param.replace('{', '{{').replace('}', '}}')
+        self._apikey_suffix_fmt = self._apikey_suffix.replace('{', '{{').replace('}', '}}')
+
+        # Set up persistent and in-memory cache
+        self._cache = FileCache(cache_dir) if cache_dir else None
+        self._mem_cache = MemoryCache(memory_cache_size) if memory_cache_size > 0 else None
+        self.cache_ttl = cache_ttl
+        self.endpoint_ttl = dict(ENDPOINT_TTL, **(endpoint_ttl or {}))
+        self.stale_on_error = stale_on_error
+        # Url (without "limit") -> (limit, url) of cached response with the highest limit, see _getCachedSubset
+        self._limit_index = {}
+        # Responses of getters with their own "ttl" are always kept in memory, even without cache. They are kept
+        # encoded, so every caller gets its own copy, which it can modify.
+        self._memo = MemoryCache(256)
+
+        # Use shared session if given
+        self.session = session
+        self._owns_session = session is None
+
+        # Otherwise start new HTTP/2 session if requested. It only retries requests that failed to connect.
+        if self.session is None and http2 and httpx is not None:
+            try:
+                transport = httpx.HTTPTransport(http2=True, retries=3, limits=httpx.Limits(
+                    max_connections=64, max_keepalive_connections=32))
+                self.session = httpx.Client(transport=transport, headers=HEADERS, timeout=TIMEOUT)
+            except ImportError:
+                # HTTP/2 support requires "h2" package, fall back to requests session
+                pass
+        self.http2 = httpx is not None and isinstance(self.session, httpx.Client)
+
+        # Otherwise start new session, which retries requests that failed because of rate limit or server errors.
+        # After the last retry response is returned as it is, so it is handled the same as any other failed request.
+        # Connection pool is large enough to be shared by many threads (see FMP.map). When all of its connections are
+        # in use, further threads wait for a free one instead of opening connections, which would be discarded after
+        # the request.
+        if self.session is None:
+            self.session = requests.Session()
+            # Rate limited requests wait for as long as API asks in "Retry-After" header
+            retries = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                            allowed_methods=['GET'], respect_retry_after_header=True, raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, pool_block=True, max_retries=retries)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+            self.session.headers.update(HEADERS)
+            self.session.headers['Connection'] = 'keep-alive'
+        if prefetch:
+            threading.Thread(target=self._openConnection, daemon=True).start()
 
         # Construct objects from children classes
         self.StockFundamentals = self.StockFundamentals(self)
@@ -51,18 +687,696 @@ class FMP:
         self.BulkAndBatch = self.BulkAndBatch(self)
         self.MarketIndexes = self.MarketIndexes(self)
 
-    def request(self, url: str):
+        # Asynchronous session, unless given, is only started on first async request
+        self.async_session = async_session
+        self._owns_async_session = async_session is None
+
+        # Construct asynchronous variants of children classes
+        self.Async = self.Async(self)
+        self.DataFrames = self.DataFrames(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    def request(self, url: str, force_refresh: bool = False, no_cache: bool = False, as_dataframe: bool = False,
+                ttl: int = None):
+
+        # Convert response to DataFrame if requested
+        if as_dataframe:
+            return self._toDataFrame(url, self.request(url, force_refresh, no_cache, ttl=ttl))
+
+        # Return cached response if available
+        if not force_refresh and not no_cache:
+            body = self._getMemoized(url, ttl) if ttl is not None else None
+            if body is None:
+                body = self._getCached(url, max_age=ttl)
+            if body is None:
+                body = self._getCachedSubset(url, max_age=ttl)
+            if body is not None:
+                return body
+
+        # Expired cached response is revalidated with conditional request, if API sent its ETag or Last-Modified
+        cached_body, validators = (None, None) if no_cache else self._getRevalidation(url)
+
+        # Send request and save response
+        try:
+            resp = self.session.get(url, headers=validators, timeout=TIMEOUT)
+        except _HTTP_ERRORS as error:
+            body = self._getStale(url, error)
+            if body is not None:
+                return body
+            raise
+
+        # Cached response is still valid
+        if resp.status_code == 304 and cached_body is not None:
+            self._setCached(url, cached_body, validators, memoize=ttl is not None)
+            return cached_body
+
+        # Check if response code is 200
+        if resp.status_code == 200:
+            body = _loads(resp.content)
+            if not no_cache:
+                self._setCached(url, body, self._getValidators(resp.headers), memoize=ttl is not None)
+            return body
+        else:
+            body = self._getStale(url, resp.status_code)
+            if body is not None:
+                return body
+            raise _httpError(resp.status_code, resp.content, resp.headers)
+
+    def request_iter(self, url: str, prefix: str = 'item'):
+        """
+        Streams response and yields records one by one, without loading the whole response in memory first. Records
+        are selected with ijson prefix, "item" yields the items of top level list. Streamed responses are not cached.
+
+        If ijson is not installed, the whole response is parsed and only top level list items are yielded.
+
+        Parameter           data type           example
+        url                 str                 'https://financialmodelingprep.com/api/v3/...'
+        prefix              str                 'item' or 'historical.item'
+        """
+
+        if ijson is None:
+            if prefix != 'item':
+                raise ImportError('Streaming with prefix other than "item" requires "ijson" package!')
+            yield from self.request(url, no_cache=True)
+            return
+
+        if self.http2:
+            with self.session.stream('GET', url) as resp:
+                # Check if response code is 200
+                if resp.status_code != 200:
+                    raise _httpError(resp.status_code, next(resp.iter_bytes(FMPError.MAX_BODY), b''), resp.headers)
+
+                # Feed decompressed chunks to ijson as they arrive
+                records = ijson.sendable_list()
+                parser = ijson.items_coro(records, prefix, use_float=True)
+                for chunk in resp.iter_bytes():
+                    parser.send(chunk)
+                    yield from records
+                    del records[:]
+                parser.close()
+                yield from records
+            return
+
+        with self.session.get(url, stream=True, timeout=TIMEOUT) as resp:
+            # Check if response code is 200
+            if resp.status_code != 200:
+                raise _httpError(resp.status_code, next(resp.iter_content(FMPError.MAX_BODY), b''), resp.headers)
+
+            # Let urllib3 decompress gzip-ed response while streaming
+            resp.raw.decode_content = True
+            yield from ijson.items(resp.raw, prefix, use_float=True)
+
+    def request_bytes(self, url: str):
+        """
+        Returns raw (decompressed) response body, e.g. to be parsed straight into typed objects. Raw responses are not
+        cached.
+
+        Parameter           data type           example
+        url                 str                 'https://financialmodelingprep.com/api/v3/...'
+        """
+
+        resp = self.session.get(url, timeout=TIMEOUT)
+
+        # Check if response code is 200
+        if resp.status_code != 200:
+            raise _httpError(resp.status_code, resp.content, resp.headers)
+        return resp.content
+
+    def map(self, fn, args_iter, max_workers: int = 16):
+        """
+        Calls "fn" for every item of "args_iter" concurrently and returns list of results in the same order.
+
+        Tuple items are unpacked as positional arguments, any other item is passed as the only argument.
+
+        Parameter           data type           example
+        fn                  function            fmp.StockFundamentals.getSharesFloat
+        args_iter           iterable            ['AAPL', 'MSFT'] or [('AAPL', 'annual'), ('MSFT', 'annual')]
+        max_workers         int                 16
+        """
+
+        def call(args):
+            return fn(*args) if isinstance(args, tuple) else fn(args)
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(call, args_iter))
+
+    def _openConnection(self):
+        """
+        Opens connection to API (TCP and TLS handshake) with a HEAD request, so it is ready in connection pool before
+        the first request. API key isn't sent, so this doesn't count as API call.
+        """
+
+        try:
+            self.session.head('https://financialmodelingprep.com/', timeout=10)
+        except _HTTP_ERRORS:
+            # Connection will just be opened by the first request instead
+            pass
+
+    def _toDataFrame(self, url: str, body):
+        """
+        Converts response body to pandas DataFrame. Columns listed in "_SCHEMA" for url's endpoint are converted to
+        their data types.
+
+        Lists of records become rows, historical data is taken from "historical" element and any other object is
+        returned as a single row.
+        """
+
+        # pandas takes longer to import than the rest of the module, so it is only imported once it is needed
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError('DataFrames require "pandas" package. Install it with "pip install pandas"!') from None
+
+        if isinstance(body, dict):
+            body = body['historical'] if isinstance(body.get('historical'), list) else [body]
+        df = pd.DataFrame.from_records(body)
+
+        for column, dtype in _SCHEMA.get(self._getEndpoint(url), {}).items():
+            if column in df:
+                if dtype.startswith('datetime64'):
+                    df[column] = pd.to_datetime(df[column], errors='coerce').astype(dtype)
+                else:
+                    df[column] = df[column].astype(dtype)
+
+        return df
+
+    @staticmethod
+    def _getEndpoint(url: str):
+        """
+        Returns endpoint name of url, e.g. "income-statement" for ".../api/v3/income-statement/AAPL?...".
+        """
+
+        parts = urllib.parse.urlsplit(url).path.strip('/').split('/')
+        if len(parts) > 2 and parts[0] == 'api':
+            return parts[2]
+        return parts[-1]
+
+    def _getCacheKey(self, url: str):
+        """
+        Returns cache key of url. API key parameter is left out, so it is never written to disk.
+        """
+
+        url = url.replace(self._apikey_suffix, '').replace(self._apikey_param, '?')
+        return hashlib.md5(url.encode()).hexdigest()
+
+    def _getCacheTTL(self, endpoint: str):
+        return self.endpoint_ttl.get(endpoint, self.cache_ttl)
+
+    def _getCachedEntry(self, url: str, ignore_ttl: bool = False, max_age: int = None):
+        """
+        Returns (timestamp, body, validators) tuple of cached response of url or None, if it is not cached or it has
+        expired. Response older than "max_age" seconds ("ttl" of getter) has expired as well, even if its endpoint is
+        cached for longer.
+
+        In-memory cache is checked first, persistent cache only on in-memory cache miss.
+        """
+
+        if self._mem_cache is None and self._cache is None:
+            return None
+
+        endpoint = self._getEndpoint(url)
+        key = self._getCacheKey(url)
+        ttl = float('inf') if ignore_ttl else self._getCacheTTL(endpoint)
+        if max_age is not None:
+            ttl = min(ttl, max_age)
+        now = time.time()
+
+        if self._mem_cache is not None:
+            entry = self._mem_cache.get(key)
+            if entry is not None and now - entry[0] <= ttl:
+                return entry
+
+        if self._cache is not None:
+            entry = self._cache.get(endpoint, key)
+            if entry is not None and now - entry[0] <= ttl:
+                if self._mem_cache is not None:
+                    self._mem_cache.set(key, entry)
+                return entry
+
+        return None
+
+    def _getCached(self, url: str, ignore_ttl: bool = False, max_age: int = None):
+        """
+        Returns cached response of url or None, if it is not cached or it has expired.
+        """
+
+        entry = self._getCachedEntry(url, ignore_ttl, max_age)
+        return entry[1] if entry is not None else None
+
+    def _splitLimit(self, url: str):
+        """
+        Returns (url without "limit" parameter, limit) tuple of url of endpoint listed in _LIMIT_ENDPOINTS or
+        (None, None) for any other url.
+        """
+
+        if self._getEndpoint(url) not in _LIMIT_ENDPOINTS:
+            return None, None
+
+        parts = urllib.parse.urlsplit(url)
+        query = urllib.parse.parse_qsl(parts.query)
+        limits = [value for name, value in query if name == 'limit']
+        if len(limits) != 1 or not limits[0].isdigit():
+            return None, None
+
+        # Order of other parameters doesn't matter
+        query = urllib.parse.urlencode(sorted((name, value) for name, value in query if name != 'limit'))
+        return parts._replace(query=query).geturl(), int(limits[0])
+
+    def _getCachedSubset(self, url: str, max_age: int = None):
+        """
+        Returns beginning of cached response of the same url with higher "limit" or None, if there is none.
+        """
+
+        base, limit = self._splitLimit(url)
+        if base is None or base not in self._limit_index:
+            return None
+
+        cached_limit, cached_url = self._limit_index[base]
+        if cached_limit < limit:
+            return None
+
+        body = self._getCached(cached_url, max_age=max_age)
+        if body is None:
+            # It has expired, the next saved response takes its place
+            self._limit_index.pop(base, None)
+            return None
+        return body[:limit] if isinstance(body, list) else None
+
+    def _getRevalidation(self, url: str):
+        """
+        Returns (body, headers) tuple of cached (or memoized) response of url regardless of its age and headers of
+        conditional request, which revalidates it. Returns (None, None) if it is not cached or API didn't send ETag or
+        Last-Modified header with it.
+        """
+
+        entry = self._getCachedEntry(url, ignore_ttl=True)
+        if entry is None:
+            # Memoized responses of rarely changing lists are revalidated as well, even without cache
+            entry = self._memo.get(self._getCacheKey(url))
+            if entry is not None:
+                entry = (entry[0], _loads(entry[1]), entry[2])
+        if entry is None or not entry[2]:
+            return None, None
+        return entry[1], entry[2]
+
+    @staticmethod
+    def _getValidators(headers):
+        """
+        Returns headers of conditional request from ETag and Last-Modified response headers or None, if there are none.
+        """
+
+        validators = {}
+        if headers.get('ETag'):
+            validators['If-None-Match'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = headers['Last-Modified']
+        return validators or None
+
+    def _getMemoized(self, url: str, ttl: int):
+        """
+        Returns response of url, which was memoized less than "ttl" seconds ago, or None.
+        """
+
+        entry = self._memo.get(self._getCacheKey(url))
+        if entry is not None and time.time() - entry[0] <= ttl:
+            return _loads(entry[1])
+        return None
+
+    def _setCached(self, url: str, body, validators: dict = None, memoize: bool = False):
+        if memoize:
+            self._memo.set(self._getCacheKey(url), (time.time(), _dumps(body), validators))
+
+        if self._mem_cache is None and self._cache is None:
+            return
+
+        key = self._getCacheKey(url)
+        entry = (time.time(), body, validators)
+
+        base, limit = self._splitLimit(url)
+        if base is not None and limit >= self._limit_index.get(base, (0, None))[0]:
+            self._limit_index[base] = (limit, url)
+
+        if self._mem_cache is not None:
+            self._mem_cache.set(key, entry)
+        if self._cache is not None:
+            try:
+                self._cache.set(self._getEndpoint(url), key, entry)
+            except OSError:
+                # Directory isn't writable or disk is full, response is just requested again next time
+                pass
+
+    def _getStale(self, url: str, reason):
+        """
+        Returns cached response of failed request regardless of its age, if "stale_on_error" is enabled. "reason" is
+        either exception or HTTP status code, only rate limit (429) and server errors (5xx) are served stale, other
+        client errors (401, 403, 404, ...) would fail the same way again.
+        """
+
+        if not self.stale_on_error:
+            return None
+        if isinstance(reason, int) and reason != 429 and reason < 500:
+            return None
+
+        body = self._getCached(url, ignore_ttl=True)
+        if body is not None:
+            warnings.warn('Serving stale cached response for "{URL}", request failed with "{REASON}"'.format(
+                URL=url.replace(self.API_KEY, '***'), REASON=reason))
+
+        return body
+
+    def clear_memory_cache(self):
+        """
+        Removes all responses from in-memory cache, together with memoized responses of getters with their own
+        lifetime and countries of stock screener.
+        """
+
+        self._memo.clear()
+        self._limit_index.clear()
+        FMP.StockLookUpTool._country_cache.pop(self.API_KEY, None)
+        if self._mem_cache is not None:
+            self._mem_cache.clear()
+
+    def clear_cache(self):
+        """
+        Removes all responses from in-memory and persistent cache.
+        """
+
+        self.clear_memory_cache()
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _getCountryList(self):
+        """
+        Returns set of countries supported by stock screener.
+
+        They rarely change, so they are saved on disk ("cache_dir" or COUNTRY_CACHE_DIR) and in memory of the process
+        (StockLookUpTool._country_cache) and requested again only after COUNTRY_LIST_TTL seconds. They are always
+        requested synchronously, also when stock screener is used through "FMP.Async".
+        """
+
+        country_cache = FMP.StockLookUpTool._country_cache
+        entry = country_cache.get(self.API_KEY)
+        if entry is not None and time.time() - entry[0] <= COUNTRY_LIST_TTL:
+            return entry[1]
+
+        cache = self._cache or FileCache(COUNTRY_CACHE_DIR)
+        entry = cache.get('get-all-countries', 'countries')
+        if entry is None or time.time() - entry[0] > COUNTRY_LIST_TTL:
+            countries = self.request(f'{_BASE_V3}/get-all-countries{self._apikey_param}', no_cache=True)
+            entry = (time.time(), countries, None)
+            try:
+                cache.set('get-all-countries', 'countries', entry)
+            except OSError:
+                # Directory isn't writable, countries are just requested again next time
+                pass
+
+        # Kept in memory only for the rest of lifetime of saved countries
+        countries = frozenset(entry[1])
+        country_cache[self.API_KEY] = (entry[0], countries)
+        return countries
+
+    def _getAsyncSession(self):
+        """
+        Returns asynchronous session, which is started on first use.
+        """
+
+        if self.async_session is None:
+            if httpx is None:
+                raise ImportError('Asynchronous requests require "httpx" package. Install it with '
+                                  '"pip install httpx[http2]"!')
+
+            # Over HTTP/2 concurrent requests are multiplexed over a single connection to API. Same as synchronous
+            # HTTP/2 session, requests which failed to connect are retried.
+            limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            try:
+                transport = httpx.AsyncHTTPTransport(http2=True, retries=3, limits=limits)
+            except ImportError:
+                # HTTP/2 support requires "h2" package, fall back to HTTP/1.1
+                transport = httpx.AsyncHTTPTransport(retries=3, limits=limits)
+            self.async_session = httpx.AsyncClient(transport=transport, headers=HEADERS, timeout=TIMEOUT)
+
+        return self.async_session
+
+    async def request_async(self, url: str, force_refresh: bool = False, no_cache: bool = False,
+                            as_dataframe: bool = False, ttl: int = None):
+
+        # Convert response to DataFrame if requested
+        if as_dataframe:
+            return self._toDataFrame(url, await self.request_async(url, force_refresh, no_cache, ttl=ttl))
+
+        # Return cached response if available
+        if not force_refresh and not no_cache:
+            body = self._getMemoized(url, ttl) if ttl is not None else None
+            if body is None:
+                body = self._getCached(url, max_age=ttl)
+            if body is None:
+                body = self._getCachedSubset(url, max_age=ttl)
+            if body is not None:
+                return body
+
+        # Expired cached response is revalidated with conditional request, if API sent its ETag or Last-Modified
+        cached_body, validators = (None, None) if no_cache else self._getRevalidation(url)
 
         # Send request and save response
-        resp = self.session.get(url)
+        try:
+            resp = await self._getAsyncSession().get(url, headers=validators)
+        except httpx.HTTPError as error:
+            body = self._getStale(url, error)
+            if body is not None:
+                return body
+            raise
+
+        # Cached response is still valid
+        if resp.status_code == 304 and cached_body is not None:
+            self._setCached(url, cached_body, validators, memoize=ttl is not None)
+            return cached_body
 
         # Check if response code is 200
         if resp.status_code == 200:
-            return resp.json()
+            body = _loads(resp.content)
+            if not no_cache:
+                self._setCached(url, body, self._getValidators(resp.headers), memoize=ttl is not None)
+            return body
         else:
-            raise Exception(
-                'Expected response "200 - OK", instead you got "' + str(resp.status_code) + ' - ' + str(
-                    resp.content) + '"')
+            body = self._getStale(url, resp.status_code)
+            if body is not None:
+                return body
+            raise _httpError(resp.status_code, resp.content, resp.headers)
+
+    async def gather(self, coros, max_concurrency: int = 16):
+        """
+        Awaits all given coroutines concurrently and returns their results in the same order.
+
+        At most "max_concurrency" of them are awaited at once, so FMP rate limits are respected.
+
+        Parameter           data type           example
+        coros               list                [fmp.Async.StockFundamentals.getSharesFloat('AAPL'), ...]
+        max_concurrency     int                 16
+        """
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*[run(coro) for coro in coros])
+
+    async def gather_many(self, urls, max_concurrency: int = 16):
+        """
+        Requests all given urls concurrently and returns their responses in the same order.
+
+        Parameter           data type           example
+        urls                list                ['https://financialmodelingprep.com/api/v3/...', ...]
+        max_concurrency     int                 16
+        """
+
+        return await self.gather([self.request_async(url) for url in urls], max_concurrency)
+
+    async def gather_quotes(self, tickers, chunk: int = 100):
+        """
+        Requests quotes of all given tickers concurrently, "chunk" tickers per request, and returns them in one list.
+
+        Parameter           data type           example
+        tickers             list                ['AAPL', 'MSFT', 'AMZN']
+        chunk               int                 100
+        """
+
+        return await self.Async.Prices.getQuoteBatch(tickers, chunk)
+
+    def map_async(self, fn, args_iter, max_concurrency: int = 16):
+        """
+        Same as "map", but requests are sent concurrently from a single thread with asynchronous session, which
+        scales to many more concurrent requests than threads. "fn" is a method of "fmp.Async". It can't be called
+        from a running event loop, use "gather" there instead.
+
+        Parameter           data type           example
+        fn                  function            fmp.Async.Prices.getHistoricalPrices
+        args_iter           iterable            [('AAPL', '1hour'), ('MSFT', '1hour')]
+        max_concurrency     int                 16
+        """
+
+        async def run():
+            try:
+                return await self.gather([fn(*args) if isinstance(args, tuple) else fn(args) for args in args_iter],
+                                         max_concurrency)
+            finally:
+                # Asynchronous session is bound to event loop, which is closed at the end of asyncio.run
+                await self.aclose()
+
+        return asyncio.run(run())
+
+    def _buildQueryUrl(self, url: str, params: dict, safe: str = ''):
+        """
+        Returns url with query of all "params", which are not None, and API key. Values are escaped, except for
+        characters in "safe".
+        """
+
+        query = urllib.parse.urlencode({name: value for name, value in params.items() if value is not None}, safe=safe)
+        return f'{url}?{query}{self._apikey_suffix}' if query else f'{url}{self._apikey_param}'
+
+    def _callAll(self, calls: dict):
+        """
+        Calls all functions of "calls" dict concurrently and returns dict of their results under the same keys.
+        """
+
+        return dict(zip(calls, self.map(lambda fn: fn(), calls.values(), max_workers=min(len(calls), 16) or 1)))
+
+    def _requestConcat(self, urls: list, unpack=None, records=None):
+        """
+        Requests all "urls" concurrently and returns one list with items of all their responses. Responses, which
+        aren't lists, are converted to lists with "unpack" function first. "records" is only used by FMP.DataFrames.
+        """
+
+        results = self.map(self.request, urls, max_workers=min(len(urls), 16) or 1)
+        if unpack is not None:
+            results = map(unpack, results)
+        return [item for result in results for item in result]
+
+    def close(self):
+        """
+        Closes session and its pooled connections, once FMP instance isn't needed anymore. Session given to
+        constructor is left open for the instances sharing it.
+        """
+
+        if self._owns_session:
+            self.session.close()
+
+    async def aclose(self):
+        """
+        Closes asynchronous session, if it was started. Session given to constructor is left open for the instances
+        sharing it.
+        """
+
+        if self.async_session is not None and self._owns_async_session:
+            await self.async_session.aclose()
+            self.async_session = None
+
+    class Async:
+        def __init__(self, parent):
+            """
+            Constructor
+
+            Holds the same children classes as parent class, but their methods return coroutines, which can be
+            awaited or passed to "FMP.gather" to be requested concurrently.
+            """
+
+            # Reference to parent class
+            self.parent = parent
+
+            # Children classes send their requests through this object
+            self.request = parent.request_async
+
+            # Construct objects from children classes
+            self.StockFundamentals = FMP.StockFundamentals(self)
+            self.StockFundamentalsAnalysis = FMP.StockFundamentalsAnalysis(self)
+            self.StockCalendars = FMP.StockCalendars(self)
+            self.StockLookUpTool = FMP.StockLookUpTool(self)
+            self.CompanyInformation = FMP.CompanyInformation(self)
+            self.StockNews = FMP.StockNews(self)
+            self.MarketPerformance = FMP.MarketPerformace(self)
+            self.AdvancedData = FMP.AdvancedData(self)
+            self.StockStatistics = FMP.StockStatistics(self)
+            self.InsiderTrading = FMP.InsiderTrading(self)
+            self.Prices = FMP.Prices(self)
+            self.FundHoldings = FMP.FundHoldings(self)
+            self.StockList = FMP.StockList(self)
+            self.BulkAndBatch = FMP.BulkAndBatch(self)
+            self.MarketIndexes = FMP.MarketIndexes(self)
+
+        async def _callAll(self, calls: dict):
+            # Same as FMP._callAll, but functions return coroutines
+            return dict(zip(calls, await self.parent.gather([fn() for fn in calls.values()])))
+
+        async def _requestConcat(self, urls: list, unpack=None, records=None):
+            # Same as FMP._requestConcat, but requests are sent with asynchronous session
+            results = await self.parent.gather([self.parent.request_async(url) for url in urls])
+            if unpack is not None:
+                results = map(unpack, results)
+            return [item for result in results for item in result]
+
+        def __getattr__(self, name):
+            # Everything else (API key, ...) is shared with parent class
+            if name == 'parent':
+                raise AttributeError(name)
+            return getattr(self.parent, name)
+
+    class DataFrames:
+        def __init__(self, parent):
+            """
+            Constructor
+
+            Holds the same children classes as parent class, but their methods return pandas DataFrames.
+            """
+
+            # Reference to parent class
+            self.parent = parent
+
+            # Construct objects from children classes
+            self.StockFundamentals = FMP.StockFundamentals(self)
+            self.StockFundamentalsAnalysis = FMP.StockFundamentalsAnalysis(self)
+            self.StockCalendars = FMP.StockCalendars(self)
+            self.StockLookUpTool = FMP.StockLookUpTool(self)
+            self.CompanyInformation = FMP.CompanyInformation(self)
+            self.StockNews = FMP.StockNews(self)
+            self.MarketPerformance = FMP.MarketPerformace(self)
+            self.AdvancedData = FMP.AdvancedData(self)
+            self.StockStatistics = FMP.StockStatistics(self)
+            self.InsiderTrading = FMP.InsiderTrading(self)
+            self.Prices = FMP.Prices(self)
+            self.FundHoldings = FMP.FundHoldings(self)
+            self.StockList = FMP.StockList(self)
+            self.BulkAndBatch = FMP.BulkAndBatch(self)
+            self.MarketIndexes = FMP.MarketIndexes(self)
+
+        def request(self, url: str, force_refresh: bool = False, no_cache: bool = False, ttl: int = None):
+            # Children classes send their requests through this method
+            return self.parent.request(url, force_refresh, no_cache, as_dataframe=True, ttl=ttl)
+
+        def _requestConcat(self, urls: list, unpack=None, records=None):
+            # Same as FMP._requestConcat, but items of all responses are joined first and converted to one DataFrame.
+            # "records" converts joined items to rows of DataFrame.
+            items = self.parent._requestConcat(urls, unpack)
+            if records is not None:
+                items = records(items)
+            return self.parent._toDataFrame(urls[0] if urls else '', items)
+
+        def __getattr__(self, name):
+            # Everything else (API key, ...) is shared with parent class
+            if name == 'parent':
+                raise AttributeError(name)
+            return getattr(self.parent, name)
 
     class StockFundamentals:
         def __init__(self, parent):
@@ -85,8 +1399,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/financial-statement-symbol-lists?apikey={YOUR_API_KEY}'.format(
-                YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/financial-statement-symbol-lists{self.parent._apikey_param}'
 
             return self.parent.request(url)
 
@@ -109,20 +1422,15 @@ class FMP:
             """
 
             # Check input parameters
-            if statement_type not in ['income-statement', 'balance-sheet-statement', 'cash-flow-statement']:
-                raise ValueError('Parameter "statement_type" not specified correctly. Should be "income-statement", '
-                                 '"balance-sheet-statement" or "cash-flow-statement"!')
-            if period not in ['annual', 'quarter']:
-                raise ValueError('Parameter "period" not specified correctly. Should be "annual" or "quarter"!')
+            _validate(statement_type, 'statement_type', _STMT3)
+            _validate(period, 'period', _PERIODS)
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/{STATEMENT_TYPE}/{TICKER}?period={PERIOD}&apikey=' \
-                  '{YOUR_API_KEY}'.format(STATEMENT_TYPE=statement_type, TICKER=ticker, PERIOD=period,
-                                          YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/{statement_type}/{_quote(ticker)}?period={period}{self.parent._apikey_suffix}'
 
-            # Append limit to url if C
+            # Append limit to url if available
             if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                url += f'&limit={limit}'
 
             return self.parent.request(url)
 
@@ -144,21 +1452,16 @@ class FMP:
             """
 
             # Check input parameters
-            if statement_type not in ['income-statement', 'balance-sheet-statement', 'cash-flow-statement',
-                                      'financial-statement-full']:
-                raise ValueError('Parameter "statement_type" not specified correctly. Should be "income-statement", '
-                                 '"balance-sheet-statement", "cash-flow-statement" or "financial-statement-full"!')
-            if period not in ['annual', 'quarter']:
-                raise ValueError('Parameter "period" not specified correctly. Should be "annual" or "quarter"!')
+            _validate(statement_type, 'statement_type', _STMT4)
+            _validate(period, 'period', _PERIODS)
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/{STATEMENT_TYPE}-as-reported/{TICKER}?period=' \
-                  '{PERIOD}&apikey={YOUR_API_KEY}'.format(STATEMENT_TYPE=statement_type, TICKER=ticker, PERIOD=period,
-                                                          YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/{statement_type}-as-reported/{_quote(ticker)}?period={period}' \
+                  f'{self.parent._apikey_suffix}'
 
             # Append limit to url if available
             if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                url += f'&limit={limit}'
 
             return self.parent.request(url)
 
@@ -177,8 +1480,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/financial-reports-dates?symbol={TICKER}&apikey=' \
-                  '{YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V4}/financial-reports-dates?symbol={_quote(ticker)}{self.parent._apikey_suffix}'
 
             return self.parent.request(url)
 
@@ -200,13 +1502,11 @@ class FMP:
             """
 
             # Check input parameters
-            if period not in ['FY', 'Q1', 'Q2', 'Q3', 'Q4']:
-                raise ValueError('Parameter "period" not specified correctly. Should "FY", "Q1", "Q2", "Q3" or "Q4"!')
+            _validate(period, 'period', _FY)
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/financial-reports-json?symbol={TICKER}&year=' \
-                  '{YEAR}&period={PERIOD}&apikey={YOUR_API_KEY}'.format(YEAR=year, TICKER=ticker, PERIOD=period,
-                                                                        YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V4}/financial-reports-json?symbol={_quote(ticker)}&year={year}' \
+                  f'&period={period}{self.parent._apikey_suffix}'
             return self.parent.request(url)
 
         def getSharesFloat(self, ticker: str):
@@ -223,8 +1523,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/shares_float?symbol={TICKER}&apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V4}/shares_float?symbol={_quote(ticker)}{self.parent._apikey_suffix}'
 
             return self.parent.request(url)
 
@@ -255,20 +1554,16 @@ class FMP:
             """
 
             # Check input parameters
-            if period not in ['annual', 'quarter', None]:
-                raise ValueError('Parameter "period" not specified correctly. Should be "annual", "quarter" or None'
-                                 ' for TTM!')
+            _validate(period, 'period', _PERIODS_OPT)
 
             # Generate url
             if period:
-                url = 'https://financialmodelingprep.com/api/v3/ratios/{TICKER}?period={PERIOD}&apikey={YOUR_API_KEY}'.format(
-                    TICKER=ticker, PERIOD=period, LIMIT=limit, YOUR_API_KEY=self.parent.API_KEY)
+                url = f'{_BASE_V3}/ratios/{_quote(ticker)}?period={period}{self.parent._apikey_suffix}'
                 # Append limit to url if available
                 if limit:
-                    url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                    url += f'&limit={limit}'
             else:
-                url = 'https://financialmodelingprep.com/api/v3/ratios-ttm/{TICKER}?apikey={YOUR_API_KEY}'.format(
-                    TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+                url = f'{_BASE_V3}/ratios-ttm/{_quote(ticker)}{self.parent._apikey_param}'
 
             return self.parent.request(url)
 
@@ -291,15 +1586,13 @@ class FMP:
             """
 
             # Check input parameters
-            if period not in ['annual', 'quarter']:
-                raise ValueError('Parameter "period" not specified correctly. Should be "annual" or "quarter"!')
+            _validate(period, 'period', _PERIODS)
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/enterprise-values/{TICKER}?period={PERIOD}&apikey=' \
-                  '{YOUR_API_KEY}'.format(TICKER=ticker, PERIOD=period, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/enterprise-values/{_quote(ticker)}?period={period}{self.parent._apikey_suffix}'
             # Append limit to url if available
             if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                url += f'&limit={limit}'
 
             return self.parent.request(url)
 
@@ -321,17 +1614,14 @@ class FMP:
             """
 
             # Check input parameters
-            if statement_type not in ['income-statement', 'balance-sheet-statement', 'cash-flow-statement']:
-                raise ValueError('Parameter "statement_type" not specified correctly. Should be "income-statement", '
-                                 '"balance-sheet-statement" or "cash-flow-statement"!')
+            _validate(statement_type, 'statement_type', _STMT3)
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/{STATEMENT_TYPE}-growth/{TICKER}?apikey={YOUR_API_KEY}'.format(
-                STATEMENT_TYPE=statement_type, TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/{statement_type}-growth/{_quote(ticker)}{self.parent._apikey_param}'
 
             # Append limit to url if available
             if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                url += f'&limit={limit}'
 
             return self.parent.request(url)
 
@@ -353,23 +1643,19 @@ class FMP:
             """
 
             # Check input parameters
-            if period not in ['annual', 'quarter', None]:
-                raise ValueError('Parameter "period" not specified correctly. Should be "annual", "quarter" or None'
-                                 ' for TTM!')
+            _validate(period, 'period', _PERIODS_OPT)
             if not period and not limit:
                 raise ValueError('When trying to get TTM data, you must specify only "ticker" and'
                                  '"limit" parameters, otherwise API will not return data!')
 
             # Generate url
             if period:
-                url = 'https://financialmodelingprep.com/api/v3/key-metrics/{TICKER}?period={PERIOD}&apikey=' \
-                      '{YOUR_API_KEY}'.format(TICKER=ticker, PERIOD=period, YOUR_API_KEY=self.parent.API_KEY)
+                url = f'{_BASE_V3}/key-metrics/{_quote(ticker)}?period={period}{self.parent._apikey_suffix}'
                 # Append limit to url if available
                 if limit:
-                    url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                    url += f'&limit={limit}'
             else:
-                url = 'https://financialmodelingprep.com/api/v3/key-metrics-ttm/{TICKER}?limit={LIMIT}&apikey=' \
-                      '{YOUR_API_KEY}'.format(TICKER=ticker, LIMIT=limit, YOUR_API_KEY=self.parent.API_KEY)
+                url = f'{_BASE_V3}/key-metrics-ttm/{_quote(ticker)}?limit={limit}{self.parent._apikey_suffix}'
 
             return self.parent.request(url)
 
@@ -391,16 +1677,14 @@ class FMP:
             """
 
             # Check input parameters
-            if period not in ['annual', 'quarter']:
-                raise ValueError('Parameter "period" not specified correctly. Should be "annual" or "quarter"!')
+            _validate(period, 'period', _PERIODS)
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/financial-growth/{TICKER}?period={PERIOD}&apikey=' \
-                  '{YOUR_API_KEY}'.format(TICKER=ticker, PERIOD=period, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/financial-growth/{_quote(ticker)}?period={period}{self.parent._apikey_suffix}'
 
             # Append limit to url if available
             if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                url += f'&limit={limit}'
 
             return self.parent.request(url)
 
@@ -421,8 +1705,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/rating/{TICKER}?apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/rating/{_quote(ticker)}{self.parent._apikey_param}'
 
             return self.parent.request(url)
 
@@ -444,8 +1727,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/historical-rating/{TICKER}?limit={LIMIT}&apikey=' \
-                  '{YOUR_API_KEY}'.format(TICKER=ticker, LIMIT=limit, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/historical-rating/{_quote(ticker)}?limit={limit}{self.parent._apikey_suffix}'
 
             return self.parent.request(url)
 
@@ -464,12 +1746,12 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/discounted-cash-flow/{TICKER}?apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/discounted-cash-flow/{_quote(ticker)}{self.parent._apikey_param}'
 
             return self.parent.request(url)
 
-        def getCompanyHistoricalDiscountedCashflow(self, ticker: str, period: str = None, limit: int = None):
+        def getCompanyHistoricalDiscountedCashflow(self, ticker: str, period: str = None, limit: int = None,
+                                                   stream: bool = False):
             """
             Company Historical Discounted cash flow value:
 
@@ -479,29 +1761,31 @@ class FMP:
             free cash flow analysis. If this value is over the current stock price the stock is considered undervalued
             and vice versa.
 
+            With stream=True a generator of records is returned, see FMP.request_iter.
+
             Parameter           data type           example
             ticker              str                 'AAPL'
             period              str                 'quarter'
             limit               int                 20
+            stream              bool                True
             """
 
             # Check input parameters
             if period and limit:
                 raise ValueError('You can only use either "period" or "limit" parameter, not both at once!')
             elif period:
-                if period not in ['annual', 'quarter']:
-                    raise ValueError('Parameter "period" not specified correctly. Should be "annual" or "quarter"!')
+                _validate(period, 'period', _PERIODS)
 
             # Generate url
             if period:
-                url = 'https://financialmodelingprep.com/api/v3/historical-discounted-cash-flow-statement/' \
-                      '{TICKER}?period={PERIOD}&apikey={YOUR_API_KEY}'.format(TICKER=ticker, PERIOD=period,
-                                                                              YOUR_API_KEY=self.parent.API_KEY)
+                url = f'{_BASE_V3}/historical-discounted-cash-flow-statement/{_quote(ticker)}' \
+                      f'?period={period}{self.parent._apikey_suffix}'
             else:
-                url = 'https://financialmodelingprep.com/api/v3/historical-daily-discounted-cash-flow/' \
-                      '{TICKER}?limit={LIMIT}&apikey={YOUR_API_KEY}'.format(TICKER=ticker, LIMIT=limit,
-                                                                            YOUR_API_KEY=self.parent.API_KEY)
+                url = f'{_BASE_V3}/historical-daily-discounted-cash-flow/{_quote(ticker)}' \
+                      f'?limit={limit}{self.parent._apikey_suffix}'
 
+            if stream:
+                return self.parent.request_iter(url)
             return self.parent.request(url)
 
     class StockCalendars:
@@ -513,6 +1797,24 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
+        def _getDateRange(self, endpoint: str, from_: str = None, to_: str = None):
+            """
+            Requests calendar endpoint, which takes optional "from_" and "to_" date range.
+            """
+
+            # Check input parameters
+            if to_ and not from_:
+                raise ValueError('You must also specify "from_" parameter!')
+            if from_:
+                _require_date(from_, 'from_')
+            if to_:
+                _require_date(to_, 'to_')
+
+            # Generate url
+            url = self.parent._buildQueryUrl(f'{_BASE_V3}/{endpoint}', {'from': from_, 'to': to_})
+
+            return self.parent.request(url)
+
         def getEarningsCalendar(self, from_: str = None, to_: str = None):
             """
             Earnings Calendar:
@@ -528,31 +1830,7 @@ class FMP:
             to_                 str                 'YYYY-mm-dd'
             """
 
-            # Check input parameters
-            if to_ and not from_:
-                raise ValueError('You must also specify "from_" parameter!')
-            if from_:
-                try:
-                    datetime.datetime.strptime(from_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "from_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-            if to_:
-                try:
-                    datetime.datetime.strptime(to_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "to_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-
-            # Generate url
-            if from_ and to_:
-                url = 'https://financialmodelingprep.com/api/v3/earning_calendar?from={FROM}&to={TO}&apikey=' \
-                      '{YOUR_API_KEY}'.format(FROM=from_, TO=to_, YOUR_API_KEY=self.parent.API_KEY)
-            elif from_:
-                url = 'https://financialmodelingprep.com/api/v3/earning_calendar?from={FROM}&apikey={YOUR_API_KEY}'.format(
-                    FROM=from_, YOUR_API_KEY=self.parent.API_KEY)
-            else:
-                url = 'https://financialmodelingprep.com/api/v3/earning_calendar'
-
-            return self.parent.request(url)
+            return self._getDateRange('earning_calendar', from_, to_)
 
         def getHistoricalEarningsCalendar(self, ticker: str, limit: int):
             """
@@ -570,8 +1848,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/historical/earning_calendar/{TICKER}?limit=' \
-                  '{LIMIT}&apikey={YOUR_API_KEY}'.format(TICKER=ticker, LIMIT=limit, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/historical/earning_calendar/{_quote(ticker)}?limit={limit}{self.parent._apikey_suffix}'
 
             return self.parent.request(url)
 
@@ -592,29 +1869,7 @@ class FMP:
             to_                 str                 'YYYY-mm-dd'
             """
 
-            # Check input parameters
-            if to_ and not from_:
-                raise ValueError('You must also specify "from_" parameter!')
-            if from_:
-                try:
-                    datetime.datetime.strptime(from_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "from_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-            if to_:
-                try:
-                    datetime.datetime.strptime(to_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "to_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-
-            # Generate url
-            if from_ and to_:
-                url = 'https://financialmodelingprep.com/api/v3/ipo_calendar?from={FROM}&to={TO}&apikey={YOUR_API_KEY}'.format(
-                    FROM=from_, TO=to_, YOUR_API_KEY=self.parent.API_KEY)
-            else:
-                url = 'https://financialmodelingprep.com/api/v3/ipo_calendar?from={FROM}&apikey={YOUR_API_KEY}'.format(
-                    FROM=from_, YOUR_API_KEY=self.parent.API_KEY)
-
-            return self.parent.request(url)
+            return self._getDateRange('ipo_calendar', from_, to_)
 
         def getStockSplitCalendar(self, from_: str = None, to_: str = None):
             """
@@ -633,29 +1888,7 @@ class FMP:
             to_                 str                 'YYYY-mm-dd'
             """
 
-            # Check input parameters
-            if to_ and not from_:
-                raise ValueError('You must also specify "from_" parameter!')
-            if from_:
-                try:
-                    datetime.datetime.strptime(from_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "from_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-            if to_:
-                try:
-                    datetime.datetime.strptime(to_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "to_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-
-            # Generate url
-            if from_ and to_:
-                url = 'https://financialmodelingprep.com/api/v3/stock_split_calendar?from={FROM}&to={TO}&apikey=' \
-                      '{YOUR_API_KEY}'.format(FROM=from_, TO=to_, YOUR_API_KEY=self.parent.API_KEY)
-            else:
-                url = 'https://financialmodelingprep.com/api/v3/stock_split_calendar?from={FROM}&apikey={YOUR_API_KEY}'.format(
-                    FROM=from_, YOUR_API_KEY=self.parent.API_KEY)
-
-            return self.parent.request(url)
+            return self._getDateRange('stock_split_calendar', from_, to_)
 
         def getDividendCalendar(self, from_: str = None, to_: str = None):
             """
@@ -673,29 +1906,7 @@ class FMP:
             to_                 str                 'YYYY-mm-dd'
             """
 
-            # Check input parameters
-            if to_ and not from_:
-                raise ValueError('You must also specify "from_" parameter!')
-            if from_:
-                try:
-                    datetime.datetime.strptime(from_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "from_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-            if to_:
-                try:
-                    datetime.datetime.strptime(to_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "to_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-
-            # Generate url
-            if from_ and to_:
-                url = 'https://financialmodelingprep.com/api/v3/stock_dividend_calendar?from={FROM}&to={TO}&apikey=' \
-                      '{YOUR_API_KEY}'.format(FROM=from_, TO=to_, YOUR_API_KEY=self.parent.API_KEY)
-            else:
-                url = 'https://financialmodelingprep.com/api/v3/stock_dividend_calendar?from={FROM}&apikey=' \
-                      '{YOUR_API_KEY}'.format(FROM=from_, YOUR_API_KEY=self.parent.API_KEY)
-
-            return self.parent.request(url)
+            return self._getDateRange('stock_dividend_calendar', from_, to_)
 
         def getEconomicCalendar(self, from_: str = None, to_: str = None):
             """
@@ -712,31 +1923,15 @@ class FMP:
             to_                 str                 'YYYY-mm-dd'
             """
 
-            # Check input parameters
-            if to_ and not from_:
-                raise ValueError('You must also specify "from_" parameter!')
-            if from_:
-                try:
-                    datetime.datetime.strptime(from_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "from_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-            if to_:
-                try:
-                    datetime.datetime.strptime(to_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "to_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
+            return self._getDateRange('economic_calendar', from_, to_)
 
-            # Generate url
-            if from_ and to_:
-                url = 'https://financialmodelingprep.com/api/v3/economic_calendar?from={FROM}&to={TO}&apikey=' \
-                      '{YOUR_API_KEY}'.format(FROM=from_, TO=to_, YOUR_API_KEY=self.parent.API_KEY)
-            else:
-                url = 'https://financialmodelingprep.com/api/v3/economic_calendar?from={FROM}&apikey={YOUR_API_KEY}'.format(
-                    FROM=from_, YOUR_API_KEY=self.parent.API_KEY)
+    class StockLookUpTool:
+        __slots__ = ('parent',)
 
-            return self.parent.request(url)
+        # API key -> (timestamp, countries) of countries supported by stock screener, shared by all instances in the
+        # process, see FMP._getCountryList
+        _country_cache = {}
 
-    class StockLookUpTool:
         def __init__(self, parent):
             """
             Constructor
@@ -745,8 +1940,6 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
-            self.countryList = None
-
         def getSearch(self, query: str, exchange: str = None, limit: int = None):
             """
             Search:
@@ -763,21 +1956,12 @@ class FMP:
             """
 
             # Check input parameters
-            if exchange not in ['ETF', 'MUTUAL_FUND', 'COMMODITY', 'INDEX', 'CRYPTO', 'FOREX', 'TSX', 'AMEX', 'NASDAQ',
-                                'NYSE', 'EURONEXT', 'XETRA', 'NSE', 'LSE', None]:
-                raise ValueError('Parameter "exchange" can only be one of the following: \n'
-                                 "['ETF', 'MUTUAL_FUND', 'COMMODITY', 'INDEX', 'CRYPTO', 'FOREX', 'TSX', 'AMEX',"
-                                 "'NASDAQ', 'NYSE', 'EURONEXT', 'XETRA', 'NSE', 'LSE']")
-
-            # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/search?query={QUERY}&apikey={YOUR_API_KEY}'.format(
-                QUERY=query, YOUR_API_KEY=self.parent.API_KEY)
-            # Append exchange to url if available
-            if exchange:
-                url = url + '&exchange={EXCHANGE}'.format(EXCHANGE=exchange)
-            # Append limit to url if available
-            if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+            if exchange is not None and exchange not in _SEARCH_EXCHANGES:
+                raise ValueError(_SEARCH_EXCHANGES_ERROR)
+
+            # Generate url, query is escaped by urlencode
+            url = self.parent._buildQueryUrl(f'{_BASE_V3}/search',
+                                             {'query': query, 'exchange': exchange or None, 'limit': limit or None})
 
             return self.parent.request(url)
 
@@ -797,21 +1981,12 @@ class FMP:
             """
 
             # Check input parameters
-            if exchange not in ['ETF', 'MUTUAL_FUND', 'COMMODITY', 'INDEX', 'CRYPTO', 'FOREX', 'TSX', 'AMEX', 'NASDAQ',
-                                'NYSE', 'EURONEXT', 'XETRA', 'NSE', 'LSE', None]:
-                raise ValueError('Parameter "exchange" can only be one of the following: \n'
-                                 "['ETF', 'MUTUAL_FUND', 'COMMODITY', 'INDEX', 'CRYPTO', 'FOREX', 'TSX', 'AMEX',"
-                                 "'NASDAQ', 'NYSE', 'EURONEXT', 'XETRA', 'NSE', 'LSE']")
-
-            # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/search-ticker?query={QUERY}&apikey={YOUR_API_KEY}'.format(
-                QUERY=query, YOUR_API_KEY=self.parent.API_KEY)
-            # Append exchange to url if available
-            if exchange:
-                url = url + '&exchange={EXCHANGE}'.format(EXCHANGE=exchange)
-            # Append limit to url if available
-            if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+            if exchange is not None and exchange not in _SEARCH_EXCHANGES:
+                raise ValueError(_SEARCH_EXCHANGES_ERROR)
+
+            # Generate url, query is escaped by urlencode
+            url = self.parent._buildQueryUrl(f'{_BASE_V3}/search-ticker',
+                                             {'query': query, 'exchange': exchange or None, 'limit': limit or None})
 
             return self.parent.request(url)
 
@@ -820,7 +1995,7 @@ class FMP:
                              betaLowerThan: float = None, volumeMoreThan: float = None, volumeLowerThan: float = None,
                              dividendMoreThan: float = None, dividendLowerThan: float = None, isEtf: bool = None,
                              isActivelyTrading: bool = None, sector: str = None, industry: str = None,
-                             country: str = None, exchange: str = None, limit: int = None):
+                             country: str = None, exchange: str = None, limit: int = None, stream: bool = False):
             """
             Stock Screener:
 
@@ -831,6 +2006,8 @@ class FMP:
             so on. For example, you can use this endpoint to find NASDAQ-listed software companies that pay dividends
             and have good liquidity.
 
+            With stream=True a generator of records is returned, see FMP.request_iter.
+
             Parameter           data type           example
             marketCapMoreThan   float               145812335.2
             marketCapLowerThan  float               145812335.2
@@ -849,79 +2026,43 @@ class FMP:
             country             str                 'US'
             exchange            str                 'nasdaq'
             limit               int                 20
+            stream              bool                True
             """
 
             # Check input parameters
-            if sector not in [None, 'Consumer Cyclical', 'Energy', 'Technology', 'Industrials', 'Financial Services',
-                              'Basic Materials', 'Communication Services', 'Consumer Defensive', 'Healthcare',
-                              'Real Estate', 'Utilities', 'Industrial Goods', 'Financial', 'Services', 'Conglomerates']:
-                raise ValueError('Parameter "sector" can only be one of the following: \n'
-                                 "['Consumer Cyclical', 'Energy', 'Technology', 'Industrials', 'Financial Services', "
-                                 "'Basic Materials', 'Communication Services', 'Consumer Defensive', 'Healthcare', "
-                                 "'Real Estate', 'Utilities', 'Industrial Goods', 'Financial', 'Services', 'Conglomerates']")
-
-            if industry not in [None, 'Autos', 'Banks', 'Banks Diversified', 'Software', 'Banks Regional',
-                                'Beverages Alcoholic', 'Beverages Brewers', 'Beverages Non-Alcoholic']:
-                raise ValueError('Parameter "industry" can only be one of the following: \n'
-                                 "['Autos', 'Banks', 'Banks Diversified', 'Software', 'Banks Regional', "
-                                 "'Beverages Alcoholic', 'Beverages Brewers', 'Beverages Non-Alcoholic']")
-
-            if exchange not in [None, 'nyse', 'nasdaq', 'amex', 'euronext', 'tsx', 'etf', 'mutual_fund']:
-                raise ValueError('Parameter "exchange" can only be one of the following: \n'
-                                 "['nyse', 'nasdaq', 'amex', 'euronext', 'tsx', 'etf', 'mutual_fund']")
-
-            # Get country list
-            if not self.countryList:
-                self.countryList = self.parent.request('https://financialmodelingprep.com/api/v3/get-all-countries'
-                                                       '?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY))
-
-            if country not in self.countryList and country is not None:
-                raise ValueError('Parameter "country" can only be one of the following: \n' + ','.join(self.countryList))
-
-            # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/stock-screener'
-            query_list = []
-            if marketCapMoreThan:
-                query_list.append('marketCapMoreThan='+str(marketCapMoreThan))
-            if marketCapLowerThan:
-                query_list.append('marketCapLowerThan='+str(marketCapLowerThan))
-            if priceMoreThan:
-                query_list.append('priceMoreThan='+str(priceMoreThan))
-            if priceLowerThan:
-                query_list.append('priceLowerThan='+str(priceLowerThan))
-            if betaMoreThan:
-                query_list.append('betaMoreThan='+str(betaMoreThan))
-            if betaLowerThan:
-                query_list.append('betaLowerThan='+str(betaLowerThan))
-            if volumeMoreThan:
-                query_list.append('volumeMoreThan='+str(volumeMoreThan))
-            if volumeLowerThan:
-                query_list.append('volumeLowerThan='+str(volumeLowerThan))
-            if dividendMoreThan:
-                query_list.append('dividendMoreThan='+str(dividendMoreThan))
-            if dividendLowerThan:
-                query_list.append('dividendLowerThan='+str(dividendLowerThan))
+            for value, (allowed, error) in zip((sector, industry, exchange), _SCREENER_VALIDATORS):
+                if value is not None and value not in allowed:
+                    raise ValueError(error)
+
+            # Get country list, only if it's needed
+            if country is not None:
+                countries = self.parent._getCountryList()
+
+                if country not in countries:
+                    raise ValueError('Parameter "country" can only be one of the following: \n' +
+                                     ','.join(sorted(countries)))
+
+            # Generate url, arguments left as None are skipped by _buildQueryUrl (0 is a valid value)
+            params = dict(zip(_SCREENER_FIELDS, (marketCapMoreThan, marketCapLowerThan, priceMoreThan, priceLowerThan,
+                                                 betaMoreThan, betaLowerThan, volumeMoreThan, volumeLowerThan,
+                                                 dividendMoreThan, dividendLowerThan, isEtf, isActivelyTrading, sector,
+                                                 industry, country, exchange, limit)))
             if isEtf is not None:
-                query_list.append('isEtf='+str(isEtf))
+                params['isEtf'] = 'true' if isEtf else 'false'
             if isActivelyTrading is not None:
-                query_list.append('isActivelyTrading='+str(isActivelyTrading))
-            if sector:
-                query_list.append('sector='+sector)
-            if industry:
-                query_list.append('industry='+industry)
-            if country:
-                query_list.append('country='+country)
-            if exchange:
-                query_list.append('exchange='+exchange)
-            if limit:
-                query_list.append('limit='+str(limit))
+                params['isActivelyTrading'] = 'true' if isActivelyTrading else 'false'
 
-            query = '?' + '&'.join(query_list)
-            url = url + query + '&apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            # Values such as 'Financial Services' are escaped by urlencode
+            url = self.parent._buildQueryUrl(f'{_BASE_V3}/stock-screener', params)
 
+            if stream:
+                return self.parent.request_iter(url)
             return self.parent.request(url)
 
     class CompanyInformation:
+        __slots__ = ('parent', '_profile_url', '_key_executives_url', '_market_cap_url', '_outlook_url', '_peers_url',
+                     '_market_open_url')
+
         def __init__(self, parent):
             """
             Constructor
@@ -930,6 +2071,16 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
+            # Url builders of endpoints, which only take a ticker, with API key already in place
+            param, suffix = parent._apikey_param_fmt, parent._apikey_suffix_fmt
+            self._profile_url = _urlTemplate(f'{_BASE_V3}/profile/{{}}{param}')
+            self._key_executives_url = _urlTemplate(f'{_BASE_V3}/key-executives/{{}}{param}')
+            self._market_cap_url = _urlTemplate(f'{_BASE_V3}/market-capitalization/{{}}{param}')
+            self._outlook_url = _urlTemplate(f'{_BASE_V4}/company-outlook?symbol={{}}{suffix}')
+            self._peers_url = _urlTemplate(f'{_BASE_V4}/stock_peers?symbol={{}}{suffix}')
+            # Url of NYSE trading hours, which takes no parameters
+            self._market_open_url = f'{_BASE_V3}/is-the-market-open{parent._apikey_param}'
+
         def getCompanyProfile(self, ticker: str):
             """
             Company Profile:
@@ -948,10 +2099,10 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/profile/{TICKER}?apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._profile_url(ticker)
 
-            return self.parent.request(url)
+            # Profile changes rarely, so it's memoized for an hour
+            return self.parent.request(url, ttl=3600)
 
         def getKeyExecutives(self, ticker: str):
             """
@@ -968,10 +2119,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/key-executives/{TICKER}?apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._key_executives_url(ticker)
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
         def getMarketCapitalization(self, ticker: str):
             """
@@ -988,12 +2138,11 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/market-capitalization/{TICKER}?apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._market_cap_url(ticker)
 
             return self.parent.request(url)
 
-        def getHistoricalMarketCapitalization(self, ticker: str, limit: int = None):
+        def getHistoricalMarketCapitalization(self, ticker: str, limit: int = None, stream: bool = False):
             """
             Historical Market Capitalization:
 
@@ -1003,20 +2152,38 @@ class FMP:
             the number of outstanding shares, both of which can be found on our quote endpoint. It's crucial in
             determining whether a company is undervalued, fairly valued or overvalued.
 
+            With stream=True a generator of records is returned, see FMP.request_iter.
+
             Parameter           data type           example
             ticker              str                 'AAPL'
+            limit               int                 20
+            stream              bool                True
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/historical-market-capitalization/{TICKER}?apikey=' \
-                  '{YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/historical-market-capitalization/{_quote(ticker)}' \
+                  f'{self.parent._apikey_param}'
 
             # Append limit to url if available
             if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                url += f'&limit={limit}'
 
+            if stream:
+                return self.parent.request_iter(url)
             return self.parent.request(url)
 
+        def iterHistoricalMarketCapitalization(self, ticker: str, limit: int = None):
+            """
+            Same as getHistoricalMarketCapitalization, but yields data points one by one while the response is being
+            downloaded, so the whole history is never held in memory at once. See FMP.request_iter.
+
+            Parameter           data type           example
+            ticker              str                 'AAPL'
+            limit               int                 20
+            """
+
+            return self.getHistoricalMarketCapitalization(ticker, limit, stream=True)
+
         def getCompanyOutlook(self, ticker: str):
             """
             Company Outlook:
@@ -1032,8 +2199,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/company-outlook?symbol={TICKER}&apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._outlook_url(ticker)
 
             return self.parent.request(url)
 
@@ -1053,10 +2219,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/stock_peers?symbol={TICKER}&apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._peers_url(ticker)
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
         def getNYSETradingHours(self):
             """
@@ -1070,10 +2235,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/is-the-market-open?apikey={YOUR_API_KEY}'.format(
-                YOUR_API_KEY=self.parent.API_KEY)
+            url = self._market_open_url
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=60)
 
         def getDelistedCompanies(self, limit: int = None):
             """
@@ -1090,16 +2254,40 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/delisted-companies?apikey={YOUR_API_KEY}'.format(
-                YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/delisted-companies{self.parent._apikey_param}'
 
             # Append limit to url if available
             if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                url += f'&limit={limit}'
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
+
+        def getAllForTicker(self, ticker: str):
+            """
+            Requests profile, key executives, current and historical market capitalization, outlook, peers, press
+            releases and news of a company concurrently and returns them in a dict under the following keys:
+
+            'profile', 'keyExecutives', 'marketCapitalization', 'historicalMarketCapitalization', 'outlook', 'peers',
+            'pressReleases', 'news'
+
+            Parameter           data type           example
+            ticker              str                 'AAPL'
+            """
+
+            return self.parent._callAll({
+                'profile': lambda: self.getCompanyProfile(ticker),
+                'keyExecutives': lambda: self.getKeyExecutives(ticker),
+                'marketCapitalization': lambda: self.getMarketCapitalization(ticker),
+                'historicalMarketCapitalization': lambda: self.getHistoricalMarketCapitalization(ticker),
+                'outlook': lambda: self.getCompanyOutlook(ticker),
+                'peers': lambda: self.getStockPeers(ticker),
+                'pressReleases': lambda: self.parent.StockNews.getPressRelease(ticker),
+                'news': lambda: self.parent.StockNews.getStockNews(ticker),
+            })
 
     class StockNews:
+        __slots__ = ('parent',)
+
         def __init__(self, parent):
             """
             Constructor
@@ -1123,12 +2311,12 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/articles?page={PAGE}&size={SIZE}&apikey={YOUR_API_KEY}'.format(
-                PAGE=page, SIZE=size, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V4}/articles?page={page}&size={size}' \
+                  f'{self.parent._apikey_suffix}'
 
             return self.parent.request(url)
 
-        def getStockNews(self, tickers: str = None, limit: int = None):
+        def getStockNews(self, tickers: str = None, limit: int = None, stream: bool = False):
             """
             Stock News:
 
@@ -1138,22 +2326,20 @@ class FMP:
             news about specific stocks, you can use the tickers parameter. Since 2017, we've kept track of everything
             that's happened.
 
+            With stream=True a generator of records is returned, see FMP.request_iter.
+
             Parameters          Data type           example
             tickers             str                 'AAPL,FB,INTC'
             limit               int                 16
+            stream              bool                True
             """
 
-            # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/stock_news'
-            query_list = []
-            if tickers:
-                query_list.append('tickers={TICKERS}'.format(TICKERS=tickers))
-            if limit:
-                query_list.append('limit={LIMIT}'.format(LIMIT=limit))
-
-            query = '?' + '&'.join(query_list)
-            url = url + query + '&apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            # Generate url, commas separating tickers are left as they are
+            url = self.parent._buildQueryUrl(f'{_BASE_V3}/stock_news',
+                                             {'tickers': tickers, 'limit': limit}, safe=',')
 
+            if stream:
+                return self.parent.request_iter(url)
             return self.parent.request(url)
 
         def getPressRelease(self, ticker: str, limit: int = None):
@@ -1172,12 +2358,17 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/press-releases/{TICKER}?limit={LIMIT}&apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, LIMIT=limit, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/press-releases/{_quote(ticker)}{self.parent._apikey_param}'
+
+            # Append limit to url if available
+            if limit:
+                url += f'&limit={limit}'
 
             return self.parent.request(url)
 
     class MarketPerformace:
+        __slots__ = ('parent', '_sectors_performance_url', '_gainers_url', '_losers_url', '_actives_url')
+
         def __init__(self, parent):
             """
             Constructor
@@ -1186,6 +2377,12 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
+            # Urls of endpoints without parameters, with API key already in place
+            self._sectors_performance_url = f'{_BASE_V3}/stock/sectors-performance{parent._apikey_param}'
+            self._gainers_url = f'{_BASE_V3}/gainers{parent._apikey_param}'
+            self._losers_url = f'{_BASE_V3}/losers{parent._apikey_param}'
+            self._actives_url = f'{_BASE_V3}/actives{parent._apikey_param}'
+
         def getSectorsPERatio(self, date: str = None, exchange: str = None):
             """
             Sector PE Ratio:
@@ -1202,23 +2399,14 @@ class FMP:
 
             # Check input parameters
             if date:
-                try:
-                    datetime.datetime.strptime(date, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "date" not specified correctly. Date should be in "YYYY-mm-dd" format!')
+                _require_date(date, 'date')
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/sector_price_earning_ratio'
-            query_list = []
-            if date:
-                query_list.append('date={DATE}'.format(DATE=date))
-            if exchange:
-                query_list.append('exchange={EXCHANGE}'.format(EXCHANGE=exchange))
+            url = self.parent._buildQueryUrl(f'{_BASE_V4}/sector_price_earning_ratio',
+                                             {'date': date, 'exchange': exchange})
 
-            query = '?' + '&'.join(query_list)
-            url = url + query + '&apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
-
-            return self.parent.request(url)
+            # Ratios of past dates don't change anymore
+            return self.parent.request(url, ttl=86400 if date else None)
 
         def getIndustriesPERatio(self, date: str = None, exchange: str = None):
             """
@@ -1237,23 +2425,13 @@ class FMP:
 
             # Check input parameters
             if date:
-                try:
-                    datetime.datetime.strptime(date, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "date" not specified correctly. Date should be in "YYYY-mm-dd" format!')
+                _require_date(date, 'date')
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/industry_price_earning_ratio'
-            query_list = []
-            if date:
-                query_list.append('date={DATE}'.format(DATE=date))
-            if exchange:
-                query_list.append('exchange={EXCHANGE}'.format(EXCHANGE=exchange))
-
-            query = '?' + '&'.join(query_list)
-            url = url + query + '&apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self.parent._buildQueryUrl(f'{_BASE_V4}/industry_price_earning_ratio',
+                                             {'date': date, 'exchange': exchange})
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400 if date else None)
 
         def getStockMarketSectorPerformance(self):
             """
@@ -1265,7 +2443,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/stock/sectors-performance?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._sectors_performance_url
 
             return self.parent.request(url)
 
@@ -1282,12 +2460,12 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/historical-sectors-performance?apikey={YOUR_API_KEY}'.format(
-                YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/historical-sectors-performance' \
+                  f'{self.parent._apikey_param}'
 
             # Append limit to url if available
             if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                url += f'&limit={limit}'
 
             return self.parent.request(url)
 
@@ -1302,7 +2480,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/gainers?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._gainers_url
 
             return self.parent.request(url)
 
@@ -1318,7 +2496,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/losers?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._losers_url
 
             return self.parent.request(url)
 
@@ -1334,11 +2512,14 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/actives?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._actives_url
 
             return self.parent.request(url)
 
     class AdvancedData:
+        __slots__ = ('parent', '_sic_urls', '_sic_list_urls', '_cot_report_url', '_cot_analysis_url', '_sic_all_url',
+                     '_sic_list_all_url', '_cot_symbols_url')
+
         def __init__(self, parent):
             """
             Constructor
@@ -1347,6 +2528,22 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
+            # Url builders of SIC endpoints by their query parameter and of COT endpoints by ticker, with API key
+            # already in place
+            param, suffix = parent._apikey_param_fmt, parent._apikey_suffix_fmt
+            self._sic_urls = {name: _urlTemplate(f'{_BASE_V4}/standard_industrial_classification?{name}={{}}{suffix}')
+                              for name in _SIC_PARAMS}
+            self._sic_list_urls = {
+                name: _urlTemplate(f'{_BASE_V4}/standard_industrial_classification_list?{name}={{}}{suffix}')
+                for name in _SIC_PARAMS}
+            self._cot_report_url = _urlTemplate(f'{_BASE_V4}/commitment_of_traders_report/{{}}{param}')
+            self._cot_analysis_url = _urlTemplate(f'{_BASE_V4}/commitment_of_traders_report_analysis/{{}}{param}')
+
+            # Urls of endpoints without parameters
+            self._sic_all_url = f'{_BASE_V4}/standard_industrial_classification/all{parent._apikey_param}'
+            self._sic_list_all_url = f'{_BASE_V4}/standard_industrial_classification_list{parent._apikey_param}'
+            self._cot_symbols_url = f'{_BASE_V4}/commitment_of_traders_report/list{parent._apikey_param}'
+
         def getStandardIndustrialClassification(self, ticker: str = None, industryTitle: str = None,
                                                 cik: str = None,sic: str = None):
             """
@@ -1366,23 +2563,9 @@ class FMP:
             """
 
             # Generate url
-            if ticker:
-                url = 'https://financialmodelingprep.com/api/v4/standard_industrial_classification?symbol=' \
-                      '{TICKER}&apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
-            if industryTitle:
-                url = 'https://financialmodelingprep.com/api/v4/standard_industrial_classification?industryTitle=' \
-                      '{INDUSTRY}&apikey={YOUR_API_KEY}'.format(INDUSTRY=industryTitle, YOUR_API_KEY=self.parent.API_KEY)
-            elif cik:
-                url = 'https://financialmodelingprep.com/api/v4/standard_industrial_classification?cik=' \
-                      '{CIK}&apikey={YOUR_API_KEY}'.format(CIK=cik, YOUR_API_KEY=self.parent.API_KEY)
-            elif sic:
-                url = 'https://financialmodelingprep.com/api/v4/standard_industrial_classification?sicCode=' \
-                      '{SIC}&apikey={YOUR_API_KEY}'.format(SIC=sic, YOUR_API_KEY=self.parent.API_KEY)
-            else:
-                url = 'https://financialmodelingprep.com/api/v4/standard_industrial_classification/all?apikey' \
-                      '={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._getSicUrl(self._sic_urls, self._sic_all_url, ticker, industryTitle, cik, sic)
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
         def getStandardIndustrialClassificationList(self, ticker: str = None, industryTitle: str = None,
                                                     cik: str = None, sic: str = None):
@@ -1403,23 +2586,20 @@ class FMP:
             """
 
             # Generate url
-            if ticker:
-                url = 'https://financialmodelingprep.com/api/v4/standard_industrial_classification_list?symbol=' \
-                      '{TICKER}&apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
-            if industryTitle:
-                url = 'https://financialmodelingprep.com/api/v4/standard_industrial_classification_list?industryTitle=' \
-                      '{INDUSTRY}&apikey={YOUR_API_KEY}'.format(INDUSTRY=industryTitle, YOUR_API_KEY=self.parent.API_KEY)
-            elif cik:
-                url = 'https://financialmodelingprep.com/api/v4/standard_industrial_classification_list?cik=' \
-                      '{CIK}&apikey={YOUR_API_KEY}'.format(CIK=cik, YOUR_API_KEY=self.parent.API_KEY)
-            elif sic:
-                url = 'https://financialmodelingprep.com/api/v4/standard_industrial_classification_list?sicCode=' \
-                      '{SIC}&apikey={YOUR_API_KEY}'.format(SIC=sic, YOUR_API_KEY=self.parent.API_KEY)
-            else:
-                url = 'https://financialmodelingprep.com/api/v4/standard_industrial_classification_list?apikey' \
-                      '={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._getSicUrl(self._sic_list_urls, self._sic_list_all_url, ticker, industryTitle, cik, sic)
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
+
+        @staticmethod
+        def _getSicUrl(urls: dict, all_url: str, ticker: str, industryTitle: str, cik: str, sic: str):
+            """
+            Returns url of SIC endpoint built by "urls" from the first given parameter, or "all_url" without any.
+            """
+
+            for name, value in zip(_SIC_PARAMS, (ticker, industryTitle, cik, sic)):
+                if value:
+                    return urls[name](value)
+            return all_url
 
         def getCotTradingSymbolsList(self):
             """
@@ -1432,10 +2612,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/commitment_of_traders_report/list?apikey={YOUR_API_KEY}'.format(
-                YOUR_API_KEY=self.parent.API_KEY)
+            url = self._cot_symbols_url
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
         def getCommitmentsOfTradersReport(self, ticker: str = None, from_: str = None, to_: str = None):
             """
@@ -1463,28 +2642,16 @@ class FMP:
             if to_ and not from_:
                 raise ValueError('You must also specify "from_" parameter!')
             if from_:
-                try:
-                    datetime.datetime.strptime(from_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError(
-                        'Parameter "from_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
+                _require_date(from_, 'from_')
             if to_:
-                try:
-                    datetime.datetime.strptime(to_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "to_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-
-            # Generate url
-            if from_ and to_:
-                url = 'https://financialmodelingprep.com/api/v4/commitment_of_traders_report?from={FROM}' \
-                      '&to={TO}&apikey={YOUR_API_KEY}'.format(FROM=from_, TO=to_, YOUR_API_KEY=self.parent.API_KEY)
-            elif from_:
-                url = 'https://financialmodelingprep.com/api/v4/commitment_of_traders_report?from={FROM}' \
-                      '&apikey={YOUR_API_KEY}'.format(
-                    FROM=from_, YOUR_API_KEY=self.parent.API_KEY)
+                _require_date(to_, 'to_')
+
+            # Generate url
+            if from_:
+                url = self.parent._buildQueryUrl(f'{_BASE_V4}/commitment_of_traders_report',
+                                                 {'from': from_, 'to': to_ or None})
             else:
-                url = 'https://financialmodelingprep.com/api/v4/commitment_of_traders_report/' \
-                      '{TICKER}?apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+                url = self._cot_report_url(ticker)
 
             return self.parent.request(url)
 
@@ -1509,33 +2676,23 @@ class FMP:
             if to_ and not from_:
                 raise ValueError('You must also specify "from_" parameter!')
             if from_:
-                try:
-                    datetime.datetime.strptime(from_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError(
-                        'Parameter "from_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
+                _require_date(from_, 'from_')
             if to_:
-                try:
-                    datetime.datetime.strptime(to_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "to_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
-
-            # Generate url
-            if from_ and to_:
-                url = 'https://financialmodelingprep.com/api/v4/commitment_of_traders_report_analysis?from={FROM}' \
-                      '&to={TO}&apikey={YOUR_API_KEY}'.format(FROM=from_, TO=to_, YOUR_API_KEY=self.parent.API_KEY)
-            elif from_:
-                url = 'https://financialmodelingprep.com/api/v4/commitment_of_traders_report_analysis?from={FROM}' \
-                      '&apikey={YOUR_API_KEY}'.format(
-                    FROM=from_, YOUR_API_KEY=self.parent.API_KEY)
+                _require_date(to_, 'to_')
+
+            # Generate url
+            if from_:
+                url = self.parent._buildQueryUrl(f'{_BASE_V4}/commitment_of_traders_report_analysis',
+                                                 {'from': from_, 'to': to_ or None})
             else:
-                url = 'https://financialmodelingprep.com/api/v4/commitment_of_traders_report_analysis/' \
-                      '{TICKER}?apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+                url = self._cot_analysis_url(ticker)
 
             return self.parent.request(url)
 
 
     class StockStatistics:
+        __slots__ = ('parent', '_grade_url', '_surprises_url')
+
         def __init__(self, parent):
             """
             Constructor
@@ -1544,6 +2701,11 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
+            # Url builders of endpoints by ticker, with API key already in place
+            param = parent._apikey_param_fmt
+            self._grade_url = _urlTemplate(f'{_BASE_V3}/grade/{{}}{param}')
+            self._surprises_url = _urlTemplate(f'{_BASE_V3}/earnings-surprises/{{}}{param}')
+
         def getSocialSentiment(self, ticker: str, limit: int = None):
             """
             Social Statement:
@@ -1563,12 +2725,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/social-sentiment?symbol={TICKER}&apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
-
-            # Append limit to url if available
-            if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+            url = self.parent._buildQueryUrl(f'{_BASE_V4}/social-sentiment', {'symbol': ticker, 'limit': limit or None})
 
             return self.parent.request(url)
 
@@ -1588,12 +2745,11 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/grade/{TICKER}?apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._grade_url(ticker)
 
             # Append limit to url if available
             if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+                url += f'&limit={limit}'
 
             return self.parent.request(url)
 
@@ -1611,8 +2767,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/earnings-surprises/{TICKER}?apikey={YOUR_API_KEY}'.format(
-                TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._surprises_url(ticker)
 
             return self.parent.request(url)
 
@@ -1633,20 +2788,17 @@ class FMP:
             """
 
             # Check input parameters
-            if period not in ['annual', 'quarter']:
-                raise ValueError('Parameter "period" not specified correctly. Should be "annual" or "quarter"!')
-
-            # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/analyst-estimates/{TICKER}?period={PERIOD}&limit=30' \
-                  '&apikey={YOUR_API_KEY}'.format(TICKER=ticker, PERIOD=period, YOUR_API_KEY=self.parent.API_KEY)
+            _validate(period, 'period', _PERIODS)
 
-            # Append limit to url if available
-            if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+            # Generate url, 30 estimates are requested if limit isn't given
+            url = f'{_BASE_V3}/analyst-estimates/{_quote(ticker)}?period={period}&limit={limit or 30}' \
+                  f'{self.parent._apikey_suffix}'
 
             return self.parent.request(url)
 
     class InsiderTrading:
+        __slots__ = ('parent', '_fail_to_deliver_url')
+
         def __init__(self, parent):
             """
             Constructor
@@ -1655,6 +2807,10 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
+            # Url builder of fail to deliver endpoint by ticker, with API key already in place
+            suffix = parent._apikey_suffix_fmt
+            self._fail_to_deliver_url = _urlTemplate(f'{_BASE_V4}/fail_to_deliver?symbol={{}}{suffix}')
+
         def getStockInsiderTrading(self, ticker: str = None, companyCik: str = None, reportingCik: str = None, limit: int = None):
             """
             Insider Trading:
@@ -1674,27 +2830,13 @@ class FMP:
             """
 
             # Check input parameters
-            notNoneCount = 0
-            for input in [ticker, companyCik, reportingCik]:
-                if input is not None:
-                    notNoneCount += 1
-
-            if notNoneCount > 1:
+            if (ticker is not None) + (companyCik is not None) + (reportingCik is not None) > 1:
                 raise ValueError('You can only use either "ticker", "companyCik" or "reportingCik" input parameter!')
 
-            # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/insider-trading'
-
-            if ticker:
-                url = url + '?symbol=' + ticker
-            elif companyCik:
-                url = url + '?companyCik=' + companyCik
-            elif reportingCik:
-                url = url + '?reportingCik=' + reportingCik
-
-            # Append limit to url if available
-            if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+            # Generate url, only the given one of ticker/companyCik/reportingCik is included
+            url = self.parent._buildQueryUrl(f'{_BASE_V4}/insider-trading',
+                                             {'symbol': ticker, 'companyCik': companyCik, 'reportingCik': reportingCik,
+                                              'limit': limit or None})
 
             return self.parent.request(url)
 
@@ -1718,12 +2860,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/insider-trading-rss-feed' \
-                  '?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
-
-            # Append limit to url if available
-            if limit:
-                url = url + '&limit={LIMIT}'.format(LIMIT=limit)
+            url = self.parent._buildQueryUrl(f'{_BASE_V4}/insider-trading-rss-feed', {'limit': limit or None})
 
             return self.parent.request(url)
 
@@ -1742,13 +2879,15 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/fail_to_deliver?symbol={TICKER}' \
-                  '&apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._fail_to_deliver_url(ticker)
 
             return self.parent.request(url)
 
 
     class Prices:
+        __slots__ = ('parent', '_quote_url', '_real_time_price_url', '_price_list_url', '_historical_chart_url',
+                     '_dividends_url', '_splits_url')
+
         def __init__(self, parent):
             """
             Constructor
@@ -1759,6 +2898,15 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
+            # Url builders of endpoints by ticker (or exchange), with API key already in place
+            param = parent._apikey_param_fmt
+            self._quote_url = _urlTemplate(f'{_BASE_V3}/quote/{{}}{param}')
+            self._real_time_price_url = _urlTemplate(f'{_BASE_V3}/quote-short/{{}}{param}')
+            self._price_list_url = _urlTemplate(f'{_BASE_V3}/quotes/{{}}{param}')
+            self._historical_chart_url = _urlTemplate(f'{_BASE_V3}/historical-chart/{{}}/{{}}{param}')
+            self._dividends_url = _urlTemplate(f'{_BASE_V3}/historical-price-full/stock_dividend/{{}}{param}')
+            self._splits_url = _urlTemplate(f'{_BASE_V3}/historical-price-full/stock_split/{{}}{param}')
+
         def getQuote(self, tickers: str):
             """
             Quote:
@@ -1769,15 +2917,34 @@ class FMP:
             includes fields such as the next earnings date, market cap, price, PE, EPS, and many more.
 
             Parameter           data type           example
-            tickers              str                 'AAPL,FB,AMZN'
+            tickers              str or list         'AAPL,FB,AMZN' or ['AAPL', 'FB', 'AMZN']
             """
 
+            # Join list of tickers
+            if not isinstance(tickers, str):
+                tickers = ','.join(tickers)
+
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/quote/{TICKERS}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKERS=tickers, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._quote_url(tickers)
 
             return self.parent.request(url)
 
+        def getQuoteBatch(self, tickers: list, chunk: int = 100):
+            """
+            Returns quotes of any number of tickers in one list. Tickers are requested "chunk" at a time, so each
+            request covers many tickers, and the requests are sent concurrently.
+
+            Parameter           data type           example
+            tickers             list                ['AAPL', 'FB', 'AMZN']
+            chunk               int                 100
+            """
+
+            # Generate urls
+            tickers = list(tickers)
+            urls = [self._quote_url(','.join(tickers[i:i + chunk])) for i in range(0, len(tickers), chunk)]
+
+            return self.parent._requestConcat(urls)
+
         def getRealTimePrice(self, ticker: str):
             """
             Fail to deliver:
@@ -1790,8 +2957,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/quote-short/{TICKER}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._real_time_price_url(ticker)
 
             return self.parent.request(url)
 
@@ -1807,12 +2973,11 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/quotes/{EXCHANGE}' \
-                  '?apikey={YOUR_API_KEY}'.format(EXCHANGE=exchange, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._price_list_url(exchange)
 
             return self.parent.request(url)
 
-        def getHistoricalPrices(self, ticker: str, timeframe: str):
+        def getHistoricalPrices(self, ticker: str, timeframe: str, stream: bool = False):
             """
             Stock Historical Price:
 
@@ -1821,24 +2986,83 @@ class FMP:
             This endpoint provides access to historical prices that can be used to create charts. It's updated every day
             and can go back 15 years in time.
 
+            With stream=True a generator of bars is returned, see FMP.request_iter.
+
             Parameter           data type           example
             ticker              str                 'AAPL'
             timeframe           str                 '5min'
+            stream              bool                True
             """
 
             # Check input parameters
-            if timeframe not in ['1min', '5min', '15min', '30min', '1hour', '4hour']:
+            if timeframe not in _TIMEFRAMES:
                 raise ValueError('Parameter "timeframe" not specified correctly. Should be "1min", "5min", "15min", '
                                  '"30min", "1hour" or "4hour"!')
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/historical-chart/{TIMEFRAME}/{TICKER}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker, TIMEFRAME=timeframe, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._historical_chart_url(timeframe, ticker)
 
+            if stream:
+                return self.parent.request_iter(url)
             return self.parent.request(url)
 
+        def getHistoricalPricesStream(self, ticker: str, timeframe: str, out_path: str, batch_size: int = 8192):
+            """
+            Writes historical prices (see getHistoricalPrices) to parquet file, without loading the whole response in
+            memory first. Bars are streamed from API and written in row groups of "batch_size" bars, dates as
+            timestamps and open, high, low and close prices as float64. Returns number of written bars.
+
+            Requires "pyarrow" package (and "ijson" package to stream response).
+
+            Parameter           data type           example
+            ticker              str                 'AAPL'
+            timeframe           str                 '1min'
+            out_path            str                 'AAPL_1min.parquet'
+            batch_size          int                 8192
+            """
+
+            # Same as pandas, pyarrow is only imported once it is needed
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError('Parquet files require "pyarrow" package. Install it with "pip install pyarrow"!') \
+                    from None
+
+            # Bars are checked and requested the same way as with getHistoricalPrices
+            bars = self.getHistoricalPrices(ticker, timeframe, stream=True)
+
+            schema = pa.schema([('date', pa.timestamp('s')), ('open', pa.float64()), ('high', pa.float64()),
+                                ('low', pa.float64()), ('close', pa.float64()), ('volume', pa.int64())])
+            written = 0
+            with pq.ParquetWriter(out_path, schema) as writer:
+                batch = []
+                for bar in bars:
+                    batch.append(bar)
+                    if len(batch) == batch_size:
+                        writer.write_table(self._parquetTable(batch, schema))
+                        written += len(batch)
+                        batch = []
+                if batch:
+                    writer.write_table(self._parquetTable(batch, schema))
+                    written += len(batch)
+
+            return written
+
+        @staticmethod
+        def _parquetTable(bars: list, schema):
+            """
+            Returns pyarrow table of bars, with "YYYY-mm-dd HH:MM:SS" dates converted to timestamps.
+            """
+
+            import pyarrow as pa
+
+            for bar in bars:
+                bar['date'] = datetime.datetime.fromisoformat(bar['date'])
+            return pa.Table.from_pylist(bars, schema=schema)
+
         def getHistoricalDailyPrices(self, tickers: str, seriesType: str, from_: str = None, to_: str = None,
-                                     timeSeries: int = None):
+                                     timeSeries: int = None, stream: bool = False):
             """
             Stock Historical Price:
 
@@ -1856,10 +3080,23 @@ class FMP:
             to_                 str                 'YYYY-mm-dd'
             seriesType          str                 'line'|'bar'
             timeseries          int                 20              (returns data for the past "timeseries" days)
+            stream              bool                True            (yields records of "historical" list one by one,
+                                                                    single ticker only, see FMP.request_iter)
+            """
+
+            url = self._historicalDailyPricesUrl(tickers, seriesType, from_, to_, timeSeries)
+
+            if stream:
+                return self.parent.request_iter(url, 'historical.item')
+            return self.parent.request(url)
+
+        def _historicalDailyPricesUrl(self, tickers: str, seriesType: str, from_: str, to_: str, timeSeries: int):
+            """
+            Checks parameters of getHistoricalDailyPrices and returns its url.
             """
 
             # Check input parameters
-            if seriesType not in ['line', 'bar']:
+            if seriesType not in _SERIES_TYPES:
                 raise ValueError('Parameter "timeframe" not specified correctly. Should be "line" or "bar"!')
 
             if timeSeries and from_:
@@ -1868,35 +3105,58 @@ class FMP:
             if to_ and not from_:
                 raise ValueError('You must also specify "from_" parameter!')
             if from_:
-                try:
-                    datetime.datetime.strptime(from_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "from_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
+                _require_date(from_, 'from_')
             if to_:
-                try:
-                    datetime.datetime.strptime(to_, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "to_" not specified correctly. Date should be in "YYYY-mm-dd" format!')
+                _require_date(to_, 'to_')
 
+            # Generate url
+            return self.parent._buildQueryUrl(f'{_BASE_V3}/historical-price-full/{_quote(tickers)}',
+                                              {'serietype': seriesType, 'from': from_ or None, 'to': to_ or None,
+                                               'timeseries': timeSeries or None})
 
+        def getHistoricalDailyPricesBatch(self, tickers: list, seriesType: str, from_: str = None, to_: str = None,
+                                          timeSeries: int = None, chunk: int = 3):
+            """
+            Returns historical prices (see getHistoricalDailyPrices) of any number of tickers in one list of
+            {"symbol": ..., "historical": [...]} items. Endpoint takes many tickers at once, so tickers are requested
+            "chunk" at a time (3 with free API key) and the requests are sent concurrently. FMP.DataFrames returns one
+            DataFrame with "symbol" column and a row for each day of each ticker.
 
-            # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/historical-price-full/{TICKERS}'.format(TICKERS=tickers)
-            query_list = []
-            if seriesType:
-                query_list.append('serietype=' + seriesType)
-            if from_:
-                query_list.append('from=' + from_)
-            if to_:
-                query_list.append('to=' + to_)
-            if timeSeries:
-                query_list.append('timeseries=' + str(timeSeries))
+            Parameter           data type           example
+            tickers             list                ['AAPL', 'FB', 'AMZN']
+            seriesType          str                 'line'|'bar'
+            from_               str                 'YYYY-mm-dd'
+            to_                 str                 'YYYY-mm-dd'
+            timeSeries          int                 20
+            chunk               int                 3
+            """
 
+            # Generate urls
+            tickers = list(tickers)
+            urls = [self._historicalDailyPricesUrl(','.join(tickers[i:i + chunk]), seriesType, from_, to_, timeSeries)
+                    for i in range(0, len(tickers), chunk)]
 
-            query = '?' + '&'.join(query_list)
-            url = url + query + '&apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            return self.parent._requestConcat(urls, self._unpackHistorical, self._historicalRecords)
 
-            return self.parent.request(url)
+        @staticmethod
+        def _unpackHistorical(body: dict):
+            """
+            Returns list of {"symbol": ..., "historical": [...]} items of historical prices, which are under
+            "historicalStockList" if more tickers were requested at once. Unknown tickers return empty response.
+            """
+
+            if 'historicalStockList' in body:
+                return body['historicalStockList']
+            return [body] if body else []
+
+        @staticmethod
+        def _historicalRecords(items: list):
+            """
+            Returns records of all "historical" lists of {"symbol": ..., "historical": [...]} items, each with its
+            "symbol".
+            """
+
+            return [dict(record, symbol=item['symbol']) for item in items for record in item.get('historical', [])]
 
         def getHistoricalDividends(self, ticker: str):
             """
@@ -1912,10 +3172,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/historical-price-full/stock_dividend/{TICKER}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._dividends_url(ticker)
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=3600)
 
         def getHistoricalStockSplits(self, ticker: str):
             """
@@ -1932,10 +3191,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/historical-price-full/stock_split/{TICKER}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._splits_url(ticker)
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=3600)
 
         def getSurvivorshipBiasFreeEod(self, ticker: str, date: str):
             """
@@ -1952,14 +3210,10 @@ class FMP:
 
             # Check input parameters
             if date:
-                try:
-                    datetime.datetime.strptime(date, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError('Parameter "date" not specified correctly. Date should be in "YYYY-mm-dd" format!')
+                _require_date(date, 'date')
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v4/historical-price-full/{TICKER}/{DATE}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker, DATE=date, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V4}/historical-price-full/{_quote(ticker)}/{date}{self.parent._apikey_param}'
 
             return self.parent.request(url)
 
@@ -1979,17 +3233,30 @@ class FMP:
             """
 
             # Check input parameters
-            if type not in ['sma', 'ema', 'wma', 'dema', 'tema', 'williams', 'rsi', 'adx', 'standardDeviation']:
+            if type not in _INDICATOR_TYPES:
                 raise ValueError('Parameter "type" not specified correctly. Should be "sma", "ema", "wma", "dema", '
                                  '"tema", "williams", "rsi", "adx" or "standardDeviation"!')
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/technical_indicator/daily/{TICKER}?period={PERIOD}'\
-                  '&type={TYPE}&apikey={YOUR_API_KEY}'.format(TICKER=ticker, PERIOD=period,
-                                                              TYPE=type, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/technical_indicator/daily/{_quote(ticker)}?period={period}&type={type}' \
+                  f'{self.parent._apikey_suffix}'
 
             return self.parent.request(url)
 
+        def getDailyIndicatorsBatch(self, tickers: list, period: int, type: str):
+            """
+            Returns daily indicators (see getDailyIndicators) of many tickers in a dict by ticker. Endpoint only takes
+            one ticker and its response doesn't name it, so every ticker is requested separately, concurrently.
+
+            Parameter           data type           example
+            tickers             list                ['AAPL', 'MSFT']
+            period              int                 10
+            type                str                 'sma'
+            """
+
+            return self.parent._callAll({ticker: functools.partial(self.getDailyIndicators, ticker, period, type)
+                                         for ticker in tickers})
+
         def getIntradayIndicators(self, ticker: str, timeframe: str, period: int, type: str):
             """
             Intraday Indicators:
@@ -2007,22 +3274,25 @@ class FMP:
             """
 
             # Check input parameters
-            if timeframe not in ['1min', '5min', '15min', '30min', '1hour', '4hour']:
+            if timeframe not in _TIMEFRAMES:
                 raise ValueError('Parameter "timeframe" not specified correctly. Should be "1min", "5min", "15min", '
                                  '"30min", "1hour" or "4hour"!')
-            if type not in ['sma', 'ema', 'wma', 'dema', 'tema', 'williams', 'rsi', 'adx', 'standardDeviation']:
+            if type not in _INDICATOR_TYPES:
                 raise ValueError('Parameter "type" not specified correctly. Should be "sma", "ema", "wma", "dema", '
                                  '"tema", "williams", "rsi", "adx" or "standardDeviation"!')
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/technical_indicator/{TIMEFRAME}/{TICKER}?period={PERIOD}' \
-                  '&type={TYPE}&apikey={YOUR_API_KEY}'.format(TICKER=ticker, TIMEFRAME=timeframe,PERIOD=period,
-                                                              TYPE=type, YOUR_API_KEY=self.parent.API_KEY)
+            url = f'{_BASE_V3}/technical_indicator/{timeframe}/{_quote(ticker)}?period={period}&type={type}' \
+                  f'{self.parent._apikey_suffix}'
 
             return self.parent.request(url)
 
 
     class FundHoldings:
+        __slots__ = ('parent', '_etf_holder_url', '_institutional_holder_url', '_mutual_fund_holder_url',
+                     '_etf_sector_weightings_url', '_etf_country_weightings_url', '_cik_search_url', '_cik_url',
+                     '_form_thirteen_url', '_form_thirteen_date_url', '_cusip_url', '_cik_list_url')
+
         def __init__(self, parent):
             """
             Constructor
@@ -2031,6 +3301,22 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
+            # Url builders of endpoints by ticker (or cik, company name, cusip), with API key already in place
+            param, suffix = parent._apikey_param_fmt, parent._apikey_suffix_fmt
+            self._etf_holder_url = _urlTemplate(f'{_BASE_V3}/etf-holder/{{}}{param}')
+            self._institutional_holder_url = _urlTemplate(f'{_BASE_V3}/institutional-holder/{{}}{param}')
+            self._mutual_fund_holder_url = _urlTemplate(f'{_BASE_V3}/mutual-fund-holder/{{}}{param}')
+            self._etf_sector_weightings_url = _urlTemplate(f'{_BASE_V3}/etf-sector-weightings/{{}}{param}')
+            self._etf_country_weightings_url = _urlTemplate(f'{_BASE_V3}/etf-country-weightings/{{}}{param}')
+            self._cik_search_url = _urlTemplate(f'{_BASE_V3}/cik-search/{{}}{param}')
+            self._cik_url = _urlTemplate(f'{_BASE_V3}/cik/{{}}{param}')
+            self._form_thirteen_url = _urlTemplate(f'{_BASE_V3}/form-thirteen/{{}}?date={{}}{suffix}')
+            self._form_thirteen_date_url = _urlTemplate(f'{_BASE_V3}/form-thirteen-date/{{}}{param}')
+            self._cusip_url = _urlTemplate(f'{_BASE_V3}/cusip/{{}}{param}')
+
+            # Urls of endpoints without parameters
+            self._cik_list_url = f'{_BASE_V3}/cik_list{parent._apikey_param}'
+
         def getEtfHolders(self, ticker: str):
             """
             ETF Holders:
@@ -2045,12 +3331,53 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/etf-holder/{TICKER}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._etf_holder_url(ticker)
 
             return self.parent.request(url)
 
-        def getInstitutionalHolders(self, ticker: str):
+        def getEtfHoldersTyped(self, ticker: str):
+            """
+            Same as getEtfHolders, but returns list of EtfHolder objects, validated straight from response body
+            (requires "pydantic" package). Responses are not cached.
+
+            Parameter           data type           example
+            ticker              str                 'SPY'
+            """
+
+            adapter = _typedAdapter('etf-holder')
+
+            # Generate url
+            url = self._etf_holder_url(ticker)
+
+            return adapter.validate_json(self.parent.request_bytes(url))
+
+        def getEtfHoldersRows(self, ticker: str):
+            """
+            Same as getEtfHolders, but returns list of compact EtfHolderRow objects, decoded straight from response
+            body (requires "msgspec" package). Responses are not cached.
+
+            Parameter           data type           example
+            ticker              str                 'SPY'
+            """
+
+            decoder = _rowDecoder('etf-holder')
+
+            # Generate url
+            url = self._etf_holder_url(ticker)
+
+            return decoder.decode(self.parent.request_bytes(url))
+
+        def getEtfHoldersBatch(self, tickers: list):
+            """
+            Returns holdings (see getEtfHolders) of many ETFs in a dict by ticker. ETFs are requested concurrently.
+
+            Parameter           data type           example
+            tickers             list                ['SPY', 'QQQ']
+            """
+
+            return self.parent._callAll({ticker: functools.partial(self.getEtfHolders, ticker) for ticker in tickers})
+
+        def getInstitutionalHolders(self, ticker: str, stream: bool = False):
             """
             Institutional Holders:
 
@@ -2061,16 +3388,75 @@ class FMP:
             report all of their assets, is primarily used to collect data. This endpoint can be used to keep track of
             how much a specific stock was bought or sold by institutions during a quarter.
 
+            With stream=True a generator of holders is returned, see FMP.request_iter.
+
             Parameter           data type           example
             ticker              str                 'AAPL'
+            stream              bool                True
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/institutional-holder/{TICKER}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._institutional_holder_url(ticker)
 
+            if stream:
+                return self.parent.request_iter(url)
             return self.parent.request(url)
 
+        def iterInstitutionalHolders(self, ticker: str):
+            """
+            Same as getInstitutionalHolders, but yields holders one by one while the response is being downloaded, so
+            the whole list is never held in memory at once. See FMP.request_iter.
+
+            Parameter           data type           example
+            ticker              str                 'AAPL'
+            """
+
+            return self.getInstitutionalHolders(ticker, stream=True)
+
+        def getInstitutionalHoldersTyped(self, ticker: str):
+            """
+            Same as getInstitutionalHolders, but returns list of InstitutionalHolder objects, validated straight from
+            response body (requires "pydantic" package). Responses are not cached.
+
+            Parameter           data type           example
+            ticker              str                 'AAPL'
+            """
+
+            adapter = _typedAdapter('institutional-holder')
+
+            # Generate url
+            url = self._institutional_holder_url(ticker)
+
+            return adapter.validate_json(self.parent.request_bytes(url))
+
+        def getInstitutionalHoldersRows(self, ticker: str):
+            """
+            Same as getInstitutionalHolders, but returns list of compact InstitutionalHolderRow objects, decoded
+            straight from response body (requires "msgspec" package). Responses are not cached.
+
+            Parameter           data type           example
+            ticker              str                 'AAPL'
+            """
+
+            decoder = _rowDecoder('institutional-holder')
+
+            # Generate url
+            url = self._institutional_holder_url(ticker)
+
+            return decoder.decode(self.parent.request_bytes(url))
+
+        def getInstitutionalHoldersBatch(self, tickers: list):
+            """
+            Returns institutional holders (see getInstitutionalHolders) of many tickers in a dict by ticker. Tickers are
+            requested concurrently.
+
+            Parameter           data type           example
+            tickers             list                ['AAPL', 'MSFT']
+            """
+
+            return self.parent._callAll({ticker: functools.partial(self.getInstitutionalHolders, ticker)
+                                         for ticker in tickers})
+
         def getMutualFundHolders(self, ticker: str):
             """
             Mutual Fund Holders:
@@ -2086,8 +3472,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/mutual-fund-holder/{TICKER}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._mutual_fund_holder_url(ticker)
 
             return self.parent.request(url)
 
@@ -2104,8 +3489,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/etf-sector-weightings/{TICKER}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._etf_sector_weightings_url(ticker)
 
             return self.parent.request(url)
 
@@ -2122,8 +3506,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/etf-country-weightings/{TICKER}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._etf_country_weightings_url(ticker)
 
             return self.parent.request(url)
 
@@ -2135,10 +3518,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/cik_list?apikey={YOUR_API_KEY}'.format(
-                YOUR_API_KEY=self.parent.API_KEY)
+            url = self._cik_list_url
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
         def getCikByCompanyName(self, companyName: str):
             """
@@ -2151,10 +3533,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/cik-search/{NAME}?apikey={YOUR_API_KEY}'.format(
-                NAME=companyName, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._cik_search_url(companyName)
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=3600)
 
         def getCompanyNameByCik(self, cik: str):
             """
@@ -2167,29 +3548,76 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/cik/{CIK}?apikey={YOUR_API_KEY}'.format(
-                CIK=cik, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._cik_url(cik)
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=3600)
 
-        def getForm13fByCik(self, cik: str, date: str):
+        def getForm13fByCik(self, cik: str, date: str, stream: bool = False):
             """
             Form 13F:
 
             FORM 13F statements provides position-level report of all institutional investment managers with more than
             $100m in assets under management.
 
+            With stream=True a generator of positions is returned, see FMP.request_iter.
+
             Parameter           data type           example
             cik                 str                 '0001067983'
             date                str                 '2020-06-30'
+            stream              bool                True
             """
 
+            # Check input parameters
+            _require_date(date, 'date')
+
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/form-thirteen/{CIK}?date={DATE}&apikey={YOUR_API_KEY}'.format(
-                CIK=cik, DATE=date, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._form_thirteen_url(cik, date)
 
+            if stream:
+                return self.parent.request_iter(url)
             return self.parent.request(url)
 
+        def getForm13fByCikTyped(self, cik: str, date: str):
+            """
+            Same as getForm13fByCik, but returns list of Form13FEntry objects, validated straight from response body
+            (requires "pydantic" package). Responses are not cached.
+
+            Parameter           data type           example
+            cik                 str                 '0001067983'
+            date                str                 '2020-06-30'
+            """
+
+            # Check input parameters
+            _require_date(date, 'date')
+
+            adapter = _typedAdapter('form-thirteen')
+
+            # Generate url
+            url = self._form_thirteen_url(cik, date)
+
+            return adapter.validate_json(self.parent.request_bytes(url))
+
+        def getForm13fByCikRows(self, cik: str, date: str):
+            """
+            Same as getForm13fByCik, but returns list of compact Form13FRow objects (date, cik, ticker, name of issuer,
+            shares and value), decoded straight from response body (requires "msgspec" package). Responses are not
+            cached.
+
+            Parameter           data type           example
+            cik                 str                 '0001067983'
+            date                str                 '2020-06-30'
+            """
+
+            # Check input parameters
+            _require_date(date, 'date')
+
+            decoder = _rowDecoder('form-thirteen')
+
+            # Generate url
+            url = self._form_thirteen_url(cik, date)
+
+            return decoder.decode(self.parent.request_bytes(url))
+
         def getFilingDatesByCik(self, cik: str):
             """
             Form 13F:
@@ -2201,8 +3629,7 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/form-thirteen-date/{CIK}?apikey={YOUR_API_KEY}'.format(
-                CIK=cik, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._form_thirteen_date_url(cik)
 
             return self.parent.request(url)
 
@@ -2215,13 +3642,14 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/cusip/{CUSIP}?apikey={YOUR_API_KEY}'.format(
-                CUSIP=cusip, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._cusip_url(cusip)
 
             return self.parent.request(url)
 
 
     class StockList:
+        __slots__ = ('parent', '_symbols_list_url', '_tradable_list_url', '_etf_list_url')
+
         def __init__(self, parent):
             """
             Constructor
@@ -2230,6 +3658,11 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
+            # Urls of endpoints without parameters, with API key already in place
+            self._symbols_list_url = f'{_BASE_V3}/stock/list{parent._apikey_param}'
+            self._tradable_list_url = f'{_BASE_V3}/available-traded/list{parent._apikey_param}'
+            self._etf_list_url = f'{_BASE_V3}/etf/list{parent._apikey_param}'
+
         def getSymbolsList(self):
             """
             Symbols List:
@@ -2241,10 +3674,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/stock/list' \
-                  '?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._symbols_list_url
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
         def getTradableSymbolsList(self):
             """
@@ -2257,10 +3689,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/available-traded/list' \
-                  '?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._tradable_list_url
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
         def getEtfList(self):
             """
@@ -2274,10 +3705,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/etf/list' \
-                  '?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._etf_list_url
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
 
     class BulkAndBatch:
@@ -2293,6 +3723,9 @@ class FMP:
 
 
     class MarketIndexes:
+        __slots__ = ('parent', '_sp500_history_url', '_nasdaq_url', '_dowjones_url', '_dowjones_history_url',
+                     '_symbol_list_url')
+
         def __init__(self, parent):
             """
             Constructor
@@ -2301,7 +3734,16 @@ class FMP:
             # Reference to parent class
             self.parent = parent
 
-        def getHistoricalSandP500ConstituentsList(self):
+            # Urls of constituent lists, with API key already in place
+            self._sp500_history_url = f'{_BASE_V3}/historical/sp500_constituent{parent._apikey_param}'
+            self._nasdaq_url = f'{_BASE_V3}/nasdaq_constituent{parent._apikey_param}'
+            self._dowjones_url = f'{_BASE_V3}/dowjones_constituent{parent._apikey_param}'
+            self._dowjones_history_url = f'{_BASE_V3}/historical/dowjones_constituent{parent._apikey_param}'
+
+            # Url builder of symbol lists by their type
+            self._symbol_list_url = _urlTemplate(f'{_BASE_V3}/symbol/available-{{}}{parent._apikey_param_fmt}')
+
+        def getHistoricalSandP500ConstituentsList(self, stream: bool = False):
             """
             Historical S&P 500 constituents List:
 
@@ -2310,13 +3752,19 @@ class FMP:
             This endpoint returns the history of S&P 500 securities that have been removed or added. It includes fields
             such as symbol, date, and reason, among others. You could use it in conjunction with our historical prices
             endpoint to see how these stocks' prices changed after they were added or removed.
+
+            With stream=True a generator of changes is returned, see FMP.request_iter.
+
+            Parameter           data type           example
+            stream              bool                True
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/historical/sp500_constituent' \
-                  '?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._sp500_history_url
 
-            return self.parent.request(url)
+            if stream:
+                return self.parent.request_iter(url)
+            return self.parent.request(url, ttl=86400)
 
         def getListOfNasdaq100Companies(self):
             """
@@ -2328,10 +3776,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/nasdaq_constituent' \
-                  '?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._nasdaq_url
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
         def getListOfDowJonesCompanies(self):
             """
@@ -2343,10 +3790,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/dowjones_constituent' \
-                  '?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._dowjones_url
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
         def getHistoricalDowJonesConstituentsList(self):
             """
@@ -2359,10 +3805,9 @@ class FMP:
             """
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/historical/dowjones_constituent' \
-                  '?apikey={YOUR_API_KEY}'.format(YOUR_API_KEY=self.parent.API_KEY)
+            url = self._dowjones_history_url
 
-            return self.parent.request(url)
+            return self.parent.request(url, ttl=86400)
 
         def getSymbolList(self, ticker_type: str):
             """
@@ -2375,13 +3820,12 @@ class FMP:
             """
 
             #Check input parameters
-            if ticker_type not in ['euronext', 'tsx', 'cryptocurrencies', 'forex-currency-pairs', 'commodities',
-                          'etfs', 'mutual-funds', 'indexes', 'stocks']:
-                raise ValueError('Parameter "statement_type" not specified correctly. Should be "euronext", "tsx", '
+            if ticker_type not in _SYMBOL_LIST_TYPES:
+                raise ValueError('Parameter "ticker_type" not specified correctly. Should be "euronext", "tsx", '
                                  '"cryptocurrencies", "forex-currency-pairs", "commodities", "etfs", "mutual-funds", '
                                  '"indexes" or "stocks"!')
 
             # Generate url
-            url = 'https://financialmodelingprep.com/api/v3/symbol/available-{TICKER}' \
-                  '?apikey={YOUR_API_KEY}'.format(TICKER=ticker_type, YOUR_API_KEY=self.parent.API_KEY)
+            url = self._symbol_list_url(ticker_type)
 
+            return self.parent.request(url, ttl=86400)
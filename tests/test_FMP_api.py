@@ -0,0 +1,393 @@
+import datetime
+import json
+import tempfile
+import time
+import types
+import unittest
+import urllib.parse
+import warnings
+from unittest import mock
+
+import requests
+
+from FMP_api import COUNTRY_LIST_TTL, FMP, FMPError, MemoryCache
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pydantic
+except ImportError:
+    pydantic = None
+
+
+class FakeSession:
+    """
+    Stands in for requests session. Responses are returned by "respond" function, which gets url path and returns
+    (status_code, body) or (status_code, body, response headers) tuple. Urls and headers of requests are kept in
+    "urls" and "headers".
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.urls = []
+        self.headers = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.urls.append(url)
+        self.headers.append(headers)
+        status_code, body, *response_headers = self.respond(urllib.parse.urlsplit(url).path)
+        return types.SimpleNamespace(status_code=status_code, content=json.dumps(body).encode(),
+                                     headers=response_headers[0] if response_headers else {})
+
+    def close(self):
+        pass
+
+
+def quotes(path):
+    # ".../quote/A,B" -> quotes of tickers A and B
+    return 200, [{'symbol': ticker, 'price': 1.5} for ticker in path.rsplit('/', 1)[1].split(',')]
+
+
+class UrlQuotingTest(unittest.TestCase):
+    def setUp(self):
+        self.session = FakeSession(lambda path: (200, []))
+        self.fmp = FMP('KEY', session=self.session)
+
+    def test_plain_tickers_are_unchanged(self):
+        self.fmp.Prices.getQuote(['AAPL', 'BRK-B', '^GSPC'])
+
+        self.assertEqual(self.session.urls,
+                         ['https://financialmodelingprep.com/api/v3/quote/AAPL,BRK-B,^GSPC?apikey=KEY'])
+
+    def test_path_parameters_are_escaped(self):
+        self.fmp.FundHoldings.getCikByCompanyName('Johnson & Johnson')
+        self.fmp.Prices.getHistoricalPrices('A/B', '1hour')
+        self.fmp.StockFundamentals.getSharesFloat('A&B')
+
+        self.assertEqual(self.session.urls, [
+            'https://financialmodelingprep.com/api/v3/cik-search/Johnson%20%26%20Johnson?apikey=KEY',
+            'https://financialmodelingprep.com/api/v3/historical-chart/1hour/A%2FB?apikey=KEY',
+            'https://financialmodelingprep.com/api/v4/shares_float?symbol=A%26B&apikey=KEY',
+        ])
+
+
+class QuoteBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.session = FakeSession(quotes)
+        self.fmp = FMP('KEY', session=self.session)
+
+    def test_joins_chunks(self):
+        result = self.fmp.Prices.getQuoteBatch(['A', 'B', 'C'], chunk=2)
+
+        self.assertEqual([quote['symbol'] for quote in result], ['A', 'B', 'C'])
+        self.assertEqual(len(self.session.urls), 2)
+
+    @unittest.skipIf(pd is None, 'requires pandas')
+    def test_dataframes_view(self):
+        df = self.fmp.DataFrames.Prices.getQuoteBatch(['A', 'B', 'C'], chunk=2)
+
+        self.assertIsInstance(df, pd.DataFrame)
+        self.assertEqual(list(df['symbol']), ['A', 'B', 'C'])
+        self.assertEqual(list(df['price']), [1.5, 1.5, 1.5])
+
+
+def historicalPrices(path):
+    # ".../historical-price-full/A,B" -> "historicalStockList" of tickers A and B, ".../A" -> prices of ticker A
+    tickers = path.rsplit('/', 1)[1].split(',')
+    historical = [{'date': '2021-01-05', 'close': 2.0}, {'date': '2021-01-04', 'close': 1.0}]
+    items = [{'symbol': ticker, 'historical': historical} for ticker in tickers]
+    return 200, {'historicalStockList': items} if len(items) > 1 else items[0]
+
+
+class HistoricalDailyPricesBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.fmp = FMP('KEY', session=FakeSession(historicalPrices))
+
+    def test_unpacks_both_shapes(self):
+        result = self.fmp.Prices.getHistoricalDailyPricesBatch(['A', 'B', 'C'], 'line', chunk=2)
+
+        self.assertEqual([item['symbol'] for item in result], ['A', 'B', 'C'])
+        self.assertEqual(len(result[2]['historical']), 2)
+
+    @unittest.skipIf(pd is None, 'requires pandas')
+    def test_dataframes_view(self):
+        df = self.fmp.DataFrames.Prices.getHistoricalDailyPricesBatch(['A', 'B', 'C'], 'line', chunk=2)
+
+        self.assertIsInstance(df, pd.DataFrame)
+        self.assertEqual(list(df['symbol']), ['A', 'A', 'B', 'B', 'C', 'C'])
+        self.assertEqual(list(df['close']), [2.0, 1.0] * 3)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['date']))
+
+    @unittest.skipIf(pd is None, 'requires pandas')
+    def test_dataframes_keep_prices(self):
+        # Cents of high prices (e.g. BRK-A) are kept the same as in JSON response
+        fmp = FMP('KEY', session=FakeSession(lambda path: (
+            200, {'symbol': 'BRK-A', 'historical': [{'date': '2021-01-04', 'close': 347800.01}]})))
+
+        df = fmp.DataFrames.Prices.getHistoricalDailyPrices('BRK-A', 'line')
+
+        self.assertEqual(df['close'].tolist(), [347800.01])
+
+
+class StaleOnErrorTest(unittest.TestCase):
+    URL = 'https://financialmodelingprep.com/api/v3/quote/A?apikey=KEY'
+
+    def setUp(self):
+        # First response is cached, following requests bypass cache and fail with "self.status"
+        self.status = 200
+        self.fmp = FMP('KEY', session=FakeSession(self.respond), memory_cache_size=8, stale_on_error=True)
+        self.fmp.request(self.URL)
+        self.status = None
+
+    def respond(self, path):
+        if self.status is None:
+            raise requests.ConnectionError('connection refused')
+        return self.status, [{'symbol': 'A'}]
+
+    def request(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return self.fmp.request(self.URL, force_refresh=True)
+
+    def test_connection_error_serves_stale(self):
+        self.assertEqual(self.request(), [{'symbol': 'A'}])
+
+    def test_server_error_serves_stale(self):
+        for self.status in (429, 503):
+            self.assertEqual(self.request(), [{'symbol': 'A'}])
+
+    def test_client_error_raises(self):
+        self.status = 404
+        with self.assertRaises(FMPError) as context:
+            self.request()
+        self.assertEqual(context.exception.status_code, 404)
+
+
+def statements(path):
+    # Newest statements first, "limit" isn't known from path, so the most API returns is always sent
+    return 200, [{'date': f'{year}-09-30', 'symbol': 'AAPL'} for year in range(2020, 1980, -1)]
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = time.time()
+        self.session = FakeSession(statements)
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def request(self, fmp, seconds_later: int = 0, limit: int = 40):
+        with mock.patch('time.time', return_value=self.now + seconds_later):
+            return fmp.StockFundamentals.getCompanyFinancialStatement('AAPL', 'income-statement', 'annual', limit)
+
+    def test_persistent_cache(self):
+        self.request(FMP('KEY', session=self.session, cache_dir=self.cache_dir.name))
+        # New instance reads response saved by the first one
+        self.request(FMP('KEY', session=self.session, cache_dir=self.cache_dir.name), 10)
+
+        self.assertEqual(len(self.session.urls), 1)
+
+    def test_cache_expires_after_cache_ttl(self):
+        fmp = FMP('KEY', session=self.session, cache_dir=self.cache_dir.name, memory_cache_size=8, cache_ttl=100)
+        self.request(fmp)
+        self.request(fmp, 100)
+        self.assertEqual(len(self.session.urls), 1)
+
+        self.request(fmp, 101)
+        self.assertEqual(len(self.session.urls), 2)
+
+    def test_endpoint_ttl(self):
+        fmp = FMP('KEY', session=self.session, memory_cache_size=8, endpoint_ttl={'income-statement': 10})
+        self.request(fmp)
+        self.request(fmp, 11)
+
+        self.assertEqual(len(self.session.urls), 2)
+
+    def test_lower_limit_served_from_cache(self):
+        fmp = FMP('KEY', session=self.session, memory_cache_size=8)
+        statements_40 = self.request(fmp, limit=40)
+        statements_20 = self.request(fmp, limit=20)
+
+        self.assertEqual(statements_20, statements_40[:20])
+        self.assertEqual(len(self.session.urls), 1)
+
+    def test_higher_limit_requested(self):
+        fmp = FMP('KEY', session=self.session, memory_cache_size=8)
+        self.request(fmp, limit=20)
+        self.request(fmp, limit=40)
+
+        self.assertEqual(len(self.session.urls), 2)
+
+    def test_memory_cache_drops_least_recently_used(self):
+        cache = MemoryCache(2)
+        cache.set('a', (0, 'A'))
+        cache.set('b', (0, 'B'))
+        cache.get('a')
+        cache.set('c', (0, 'C'))
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), (0, 'A'))
+        self.assertEqual(cache.get('c'), (0, 'C'))
+
+
+class RevalidationTest(unittest.TestCase):
+    ETAG = 'W/"1"'
+
+    def setUp(self):
+        self.now = time.time()
+        self.session = FakeSession(self.respond)
+        self.fmp = FMP('KEY', session=self.session, memory_cache_size=8, cache_ttl=100)
+
+    def respond(self, path):
+        # Unchanged response is only confirmed, without body
+        if self.session.headers[-1] and self.session.headers[-1].get('If-None-Match') == self.ETAG:
+            return 304, None, {}
+        return 200, [{'symbol': 'AAPL', 'floatShares': 1}], {'ETag': self.ETAG}
+
+    def request(self, seconds_later: int):
+        with mock.patch('time.time', return_value=self.now + seconds_later):
+            return self.fmp.StockFundamentals.getSharesFloat('AAPL')
+
+    def test_expired_response_revalidated(self):
+        first = self.request(0)
+        second = self.request(101)
+
+        self.assertEqual(second, first)
+        self.assertEqual(self.session.headers, [None, {'If-None-Match': self.ETAG}])
+
+    def test_revalidated_response_cached_again(self):
+        self.request(0)
+        self.request(101)
+        self.request(150)
+
+        self.assertEqual(len(self.session.urls), 2)
+
+
+class GetterTtlTest(unittest.TestCase):
+    def setUp(self):
+        self.now = time.time()
+        self.session = FakeSession(lambda path: (200, [{'isTheStockMarketOpen': True}]))
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.fmp = FMP('KEY', session=self.session, cache_dir=self.cache_dir.name, memory_cache_size=8)
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def request(self, seconds_later: int):
+        with mock.patch('time.time', return_value=self.now + seconds_later):
+            return self.fmp.CompanyInformation.getNYSETradingHours()
+
+    def test_cached_within_ttl(self):
+        self.request(0)
+        self.request(30)
+
+        self.assertEqual(len(self.session.urls), 1)
+
+    def test_cache_expires_with_ttl(self):
+        # Getter's ttl (60 seconds) is shorter than lifetime of persistent and in-memory cache
+        self.request(0)
+        self.request(120)
+
+        self.assertEqual(len(self.session.urls), 2)
+
+
+class MemoizedResponseTest(unittest.TestCase):
+    def setUp(self):
+        self.session = FakeSession(lambda path: (200, [{'symbol': 'AAPL', 'companyName': 'Apple Inc.'}]))
+        self.fmp = FMP('KEY', session=self.session)
+
+    def test_callers_get_own_copy(self):
+        first = self.fmp.CompanyInformation.getCompanyProfile('AAPL')
+        first.pop()
+        second = self.fmp.CompanyInformation.getCompanyProfile('AAPL')
+
+        self.assertEqual(second, [{'symbol': 'AAPL', 'companyName': 'Apple Inc.'}])
+        self.assertIsNot(second, self.fmp.CompanyInformation.getCompanyProfile('AAPL'))
+        self.assertEqual(len(self.session.urls), 1)
+
+
+class CountryListTest(unittest.TestCase):
+    def setUp(self):
+        self.now = time.time()
+        self.session = FakeSession(lambda path: (200, ['US', 'DE'] if path.endswith('get-all-countries') else []))
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.fmp = FMP('COUNTRY-KEY', session=self.session, cache_dir=self.cache_dir.name)
+
+    def tearDown(self):
+        self.fmp.clear_cache()
+        self.cache_dir.cleanup()
+
+    def countryRequests(self, seconds_later: int = 0):
+        # Sends stock screener request and returns how many times countries have been requested so far
+        with mock.patch('time.time', return_value=self.now + seconds_later):
+            self.fmp.StockLookUpTool.getStockScreener(country='US')
+        return sum(url.split('?')[0].endswith('get-all-countries') for url in self.session.urls)
+
+    def test_countries_requested_once(self):
+        self.assertEqual(self.countryRequests(), 1)
+        self.assertEqual(self.countryRequests(), 1)
+
+    def test_countries_expire(self):
+        self.countryRequests()
+        self.assertEqual(self.countryRequests(COUNTRY_LIST_TTL + 1), 2)
+
+    def test_clear_cache_removes_countries(self):
+        self.countryRequests()
+        self.fmp.clear_cache()
+        self.assertEqual(self.countryRequests(), 2)
+
+
+class FileCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_concurrent_writes_of_same_response(self):
+        fmp = FMP('KEY', session=FakeSession(lambda path: (200, [{'symbol': 'AAPL', 'marketCap': 1}])),
+                  cache_dir=self.cache_dir.name)
+
+        results = fmp.map(fmp.CompanyInformation.getMarketCapitalization, ['AAPL'] * 32)
+
+        self.assertEqual(results, [[{'symbol': 'AAPL', 'marketCap': 1}]] * 32)
+        self.assertEqual(fmp._getCached(fmp.CompanyInformation._market_cap_url('AAPL')), results[0])
+
+    def test_failed_write_keeps_response(self):
+        fmp = FMP('KEY', session=FakeSession(lambda path: (200, [{'symbol': 'AAPL', 'marketCap': 1}])),
+                  cache_dir=self.cache_dir.name)
+
+        with mock.patch('os.replace', side_effect=PermissionError):
+            result = fmp.CompanyInformation.getMarketCapitalization('AAPL')
+
+        self.assertEqual(result, [{'symbol': 'AAPL', 'marketCap': 1}])
+
+
+# Position of Form 13F statement, as API returns it
+FORM_13F_ENTRY = {
+    'date': '2021-09-30', 'fillingDate': '2021-11-15', 'acceptedDate': '2021-11-15 16:17:35', 'cik': '0001067983',
+    'cusip': '025816109', 'tickercusip': 'AXP', 'nameOfIssuer': 'AMERICAN EXPRESS CO', 'shares': 151610700,
+    'titleOfClass': 'COM', 'value': 25405886000,
+    'link': 'https://www.sec.gov/Archives/edgar/data/1067983/000095012321014307/0000950123-21-014307-index.htm',
+    'finalLink': 'https://www.sec.gov/Archives/edgar/data/1067983/000095012321014307/xslForm13F_X01/infotable.xml',
+}
+
+
+@unittest.skipIf(pydantic is None, 'requires pydantic')
+class TypedResponseTest(unittest.TestCase):
+    def test_form_13f_entry(self):
+        fmp = FMP('KEY', session=FakeSession(lambda path: (200, [FORM_13F_ENTRY])))
+
+        entry, = fmp.FundHoldings.getForm13fByCikTyped('0001067983', '2021-09-30')
+
+        self.assertEqual(entry.date, datetime.date(2021, 9, 30))
+        self.assertEqual(entry.acceptedDate, datetime.datetime(2021, 11, 15, 16, 17, 35))
+        self.assertEqual(entry.tickercusip, 'AXP')
+
+
+if __name__ == '__main__':
+    unittest.main()